@@ -0,0 +1,84 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from sondagemDeImagens import sondar_imagem
+
+def bytes_decodificados(info):
+    """Memória ocupada pela imagem decodificada: pixels x canais x bytes por amostra"""
+    return info.largura * info.altura * max(1, info.canais) * ((info.bits + 7) // 8)
+
+def planejar_tarefas(tarefas):
+    """
+    Sonda os cabeçalhos das entradas, rejeita tarefas inválidas e ordena das maiores para as menores
+    Args:
+        tarefas: lista de dicionários com 'nome', 'entradas' (caminhos), 'executar'
+                 (função sem argumentos que retorna True/False) e, opcionalmente,
+                 'mesmo_tamanho' (True se as entradas precisam ter as mesmas dimensões)
+    Returns:
+        Tupla (aceitas, rejeitadas): aceitas ganham a chave 'bytes' (memória das entradas
+        decodificadas) e vêm ordenadas por tamanho decrescente; rejeitadas é uma lista
+        de (tarefa, motivo)
+    """
+    aceitas, rejeitadas = [], []
+    for tarefa in tarefas:
+        infos = [sondar_imagem(caminho) for caminho in tarefa['entradas']]
+        ilegiveis = [caminho for caminho, info in zip(tarefa['entradas'], infos) if info is None]
+        if ilegiveis:
+            rejeitadas.append((tarefa, f"cabeçalho ilegível: {', '.join(ilegiveis)}"))
+            continue
+        dimensoes = {(info.largura, info.altura) for info in infos}
+        if tarefa.get('mesmo_tamanho') and len(dimensoes) > 1:
+            tamanhos = ', '.join(f'{largura}x{altura}' for largura, altura in sorted(dimensoes))
+            rejeitadas.append((tarefa, f"as imagens devem ter o mesmo tamanho ({tamanhos})"))
+            continue
+        tarefa['bytes'] = sum(bytes_decodificados(info) for info in infos)
+        aceitas.append(tarefa)
+
+    # Maiores primeiro: as tarefas longas não ficam para o fim, deixando núcleos ociosos
+    aceitas.sort(key=lambda tarefa: tarefa['bytes'], reverse=True)
+    return aceitas, rejeitadas
+
+def executar_tarefas(tarefas, orcamento_bytes=None, num_trabalhadores=None):
+    """
+    Executa as tarefas em paralelo sem ultrapassar o orçamento de memória das entradas
+    (as tarefas rodam em threads do mesmo processo: as operações agendadas não podem
+    compartilhar estado mutável entre chamadas, como os buffers de filtragemDeImagens)
+    Args:
+        tarefas: lista de tarefas (ver planejar_tarefas)
+        orcamento_bytes: máximo de bytes de entradas decodificadas ao mesmo tempo (canais e
+                         bits contam: RGBA de 16 bits pesa 8x o cinza de 8 bits); uma tarefa
+                         maior que o orçamento roda sozinha. None = sem limite
+        num_trabalhadores: threads de trabalho (None = padrão do ThreadPoolExecutor)
+    Returns:
+        Dicionário com as contagens 'sucesso', 'falha' e 'rejeitadas'
+    """
+    aceitas, rejeitadas = planejar_tarefas(tarefas)
+    for tarefa, motivo in rejeitadas:
+        print(f"❌ {tarefa['nome']}: rejeitada antes de decodificar ({motivo})")
+
+    condicao = threading.Condition()
+    em_processamento = [0]
+
+    def cabe(tamanho):
+        return (orcamento_bytes is None or em_processamento[0] == 0
+                or em_processamento[0] + tamanho <= orcamento_bytes)
+
+    def executar(tarefa):
+        with condicao:
+            condicao.wait_for(lambda: cabe(tarefa['bytes']))
+            em_processamento[0] += tarefa['bytes']
+        try:
+            return bool(tarefa['executar']())
+        except Exception as e:
+            print(f"❌ {tarefa['nome']}: {str(e)}")
+            return False
+        finally:
+            with condicao:
+                em_processamento[0] -= tarefa['bytes']
+                condicao.notify_all()
+
+    with ThreadPoolExecutor(max_workers=num_trabalhadores) as pool:
+        resultados = list(pool.map(executar, aceitas))
+
+    return {'sucesso': sum(resultados), 'falha': len(resultados) - sum(resultados),
+            'rejeitadas': len(rejeitadas)}
@@ -1,15 +1,32 @@
-import cv2
 import os
 import argparse
 import numpy as np
 
-def ajuste_gamma(imagem, gamma):
-    """Aplica correção gamma na imagem"""
+from arquivosDeImagem import carregar_imagem, salvar_imagem
+from execucaoEmFaixas import executar_em_faixas
+from perfilDesempenho import aplicar_perfil
+from precisao import obter_precisao
+
+def ajuste_gamma(imagem, gamma, precisao=None):
+    """
+    Aplica correção gamma na imagem uint8 (em faixas paralelas para imagens grandes)
+    precisao: float64, float32, float16 ou fixo16 (None = política global, ver precisao.py)
+    """
+    precisao = obter_precisao(precisao)
+    if precisao == 'fixo16':
+        # Tabela de 256 entradas calculada em float64: só inteiros passam pela imagem
+        tabela = _ajuste_gamma(np.arange(256, dtype=np.uint8), gamma, 'float64')
+        return executar_em_faixas(lambda faixa: tabela[faixa], (imagem,), imagem.shape)
+    return executar_em_faixas(lambda faixa: _ajuste_gamma(faixa, gamma, precisao), (imagem,), imagem.shape)
+
+def _ajuste_gamma(imagem, gamma, precisao):
+    """Correção gamma de uma faixa da imagem"""
     # Normaliza para [0, 1]
-    imagem_norm = imagem.astype('float32') / 255.0
+    dtype = np.dtype(precisao).type
+    imagem_norm = imagem.astype(dtype) / dtype(255.0)
     
     # Aplica correção gamma
-    imagem_corrigida = np.power(imagem_norm, 1.0/gamma)
+    imagem_corrigida = np.power(imagem_norm, dtype(1.0 / gamma))
     
     # Retorna para [0, 255] e converte para uint8
     return (imagem_corrigida * 255).clip(0, 255).astype('uint8')
@@ -17,9 +34,8 @@ def ajuste_gamma(imagem, gamma):
 def processar_imagem(caminho_entrada, caminho_saida_base, gammas):
     try:
         # Carrega a imagem (converte para tons de cinza se for colorida)
-        imagem = cv2.imread(caminho_entrada, cv2.IMREAD_GRAYSCALE)
+        imagem = carregar_imagem(caminho_entrada, normalizar=False)
         if imagem is None:
-            print(f"Erro: Não foi possível carregar a imagem {caminho_entrada}!")
             return False
 
         # Processa cada valor de gamma
@@ -31,9 +47,8 @@ def processar_imagem(caminho_entrada, caminho_saida_base, gammas):
             nome_saida = f"{os.path.splitext(os.path.basename(caminho_saida_base))[0]}_gamma{gamma}.png"
             caminho_saida = os.path.join(os.path.dirname(caminho_saida_base), nome_saida)
             
-            os.makedirs(os.path.dirname(caminho_saida), exist_ok=True)
-            cv2.imwrite(caminho_saida, imagem_corrigida)
-            print(f"✅ Imagem com γ={gamma} salva em: {caminho_saida}")
+            if not salvar_imagem(caminho_saida, imagem_corrigida, f"Imagem com γ={gamma} salva"):
+                return False
         
         return True
         
@@ -47,6 +62,7 @@ if __name__ == "__main__":
     parser.add_argument('-s', '--saida', help='Nome base do arquivo de saída (sem extensão)', default='brilho')
     
     args = parser.parse_args()
+    aplicar_perfil()
     
     # Configura caminhos
     pasta_entradas = os.path.join(os.path.dirname(__file__), 'Entradas')
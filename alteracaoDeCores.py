@@ -3,12 +3,8 @@ import os
 import argparse
 import numpy as np
 
-def carregar_imagem(caminho_entrada):
-    imagem = cv2.imread(caminho_entrada)
-    if imagem is None:
-        print(f"Erro: Não foi possível carregar a imagem {caminho_entrada}!")
-        return None
-    return imagem.astype(np.float32) / 255.0
+from arquivosDeImagem import carregar_imagem, salvar_imagem
+from perfilDesempenho import aplicar_perfil
 
 def aplicar_transformacao_cor(imagem):
     # Converte de BGR para RGB
@@ -31,17 +27,13 @@ def aplicar_transformacao_cor(imagem):
     # Converte de volta para BGR antes de salvar
     return cv2.cvtColor(transformada, cv2.COLOR_RGB2BGR)
 
-def salvar_imagem(caminho_saida, imagem):
-    os.makedirs(os.path.dirname(caminho_saida), exist_ok=True)
-    cv2.imwrite(caminho_saida, imagem)
-    print(f"✅ Imagem transformada salva em: {caminho_saida}")
-
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Aplica transformação de cores usando matriz de conversão')
     parser.add_argument('entrada', help='Nome da imagem na pasta Entradas (ex: foto.jpg)')
     parser.add_argument('--saida', '-s', help='Nome personalizado para o arquivo de saída (será salvo na pasta Saídas)', default=None)
     
     args = parser.parse_args()
+    aplicar_perfil()
     
     # Configura caminhos
     pasta_entradas = os.path.join(os.path.dirname(__file__), 'Entradas')
@@ -57,7 +49,7 @@ if __name__ == "__main__":
     caminho_saida = os.path.join(pasta_saidas, nome_saida)
     
     # Processa a imagem
-    imagem = carregar_imagem(caminho_entrada)
+    imagem = carregar_imagem(caminho_entrada, cinza=False)
     if imagem is not None:
         imagem_transformada = aplicar_transformacao_cor(imagem)
-        salvar_imagem(caminho_saida, imagem_transformada)
\ No newline at end of file
+        salvar_imagem(caminho_saida, imagem_transformada, 'Imagem transformada salva')
\ No newline at end of file
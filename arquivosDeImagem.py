@@ -0,0 +1,57 @@
+"""
+Leitura e escrita de imagens, compartilhadas por todos os scripts e pelo mc920.py.
+
+No carregamento só importa a biblioteca padrão: cv2/numpy são importados dentro das
+funções, para não pesar na inicialização do CLI (ver orcamentoInicializacao.py).
+"""
+import os
+
+from perfilDesempenho import parametros_escrita
+
+def carregar_imagem(caminho_entrada, cinza=True, normalizar=True):
+    """
+    Carrega a imagem do disco
+    Args:
+        caminho_entrada: caminho do arquivo
+        cinza: se True, converte para tons de cinza; senão carrega em BGR
+        normalizar: se True, retorna float32 no intervalo [0,1]; senão uint8 [0,255]
+    Returns:
+        Imagem carregada ou None se o arquivo não puder ser lido
+    """
+    import cv2
+
+    imagem = cv2.imread(caminho_entrada, cv2.IMREAD_GRAYSCALE if cinza else cv2.IMREAD_COLOR)
+    if imagem is None:
+        print(f"Erro: Não foi possível carregar a imagem {caminho_entrada}!")
+        return None
+    if not normalizar:
+        return imagem
+
+    import numpy as np
+    return imagem.astype(np.float32) / 255.0
+
+def salvar_imagem(caminho_saida, imagem, mensagem='Imagem salva'):
+    """
+    Salva a imagem, criando a pasta se necessário (PNG usa a compressão do perfil de desempenho)
+    Args:
+        caminho_saida: caminho do arquivo; a extensão define o formato
+        imagem: imagem uint8
+        mensagem: início da mensagem de sucesso ("✅ <mensagem> em: <caminho>"); None = não imprime
+    Returns:
+        True se salvou; False (após imprimir o erro) caso contrário
+    """
+    import cv2
+
+    try:
+        pasta = os.path.dirname(caminho_saida)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        if not cv2.imwrite(caminho_saida, imagem, parametros_escrita(caminho_saida)):
+            raise IOError(f"Falha ao salvar imagem em {caminho_saida}")
+    except Exception as e:
+        print(f"❌ Erro ao salvar imagem: {str(e)}")
+        return False
+
+    if mensagem:
+        print(f"✅ {mensagem} em: {caminho_saida}")
+    return True
@@ -0,0 +1,221 @@
+"""
+Autoajuste: micro-benchmarks das operações existentes nesta máquina para escolher
+threads do OpenCV, threads/altura das faixas, limiar de paralelismo, convolução
+separável e nível de compressão PNG. O resultado é salvo em um perfil JSON
+(ver perfilDesempenho.py) carregado por todos os scripts na inicialização.
+
+Uso: python mc920.py autoajuste [--megapixels 4] [--saida perfil.json]
+"""
+import os
+import platform
+import tempfile
+import time
+from contextlib import contextmanager
+
+import cv2
+import numpy as np
+
+from ajusteDeBrilho import ajuste_gamma
+from esbocoALapis import gerar_esboco
+from filtragemDeImagens import aplicar_filtro, criar_filtro, fatorar_filtro
+from perfilDesempenho import VARIAVEIS, parametros_escrita, salvar_perfil
+from transformacaoDeImagensColoridas import aplicar_transformacao_sepia
+
+# Threads do OpenCV antes de qualquer ajuste (padrão da biblioteca)
+_OPENCV_THREADS_PADRAO = cv2.getNumThreads()
+
+def cronometrar(funcao, repeticoes=3):
+    """Melhor tempo (s) de algumas execuções, após uma execução de aquecimento"""
+    funcao()
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+@contextmanager
+def configuracao(**valores):
+    """Executa com apenas as variáveis MC920_* indicadas (chaves do perfil); o resto volta ao padrão"""
+    antigos = {variavel: os.environ.pop(variavel, None) for variavel in VARIAVEIS.values()}
+    threads_opencv = cv2.getNumThreads()
+    for chave, valor in valores.items():
+        if valor is not None:
+            os.environ[VARIAVEIS[chave]] = ','.join(map(str, valor)) if isinstance(valor, list) else str(valor)
+    cv2.setNumThreads(int(valores.get('opencv_threads') or _OPENCV_THREADS_PADRAO))
+    try:
+        yield
+    finally:
+        for variavel, valor in antigos.items():
+            os.environ.pop(variavel, None)
+            if valor is not None:
+                os.environ[variavel] = valor
+        cv2.setNumThreads(threads_opencv)
+
+def criar_imagens(megapixels, semente=0):
+    """Imagem colorida sintética com bordas e textura (representativa para filtros e PNG)"""
+    lado = int(np.sqrt(megapixels * 1e6))
+    gerador = np.random.default_rng(semente)
+    base = cv2.resize(gerador.integers(0, 256, (lado // 16, lado // 16, 3), dtype=np.uint8),
+                      (lado, lado), interpolation=cv2.INTER_CUBIC)
+    ruido = gerador.integers(-12, 13, base.shape)
+    cor = np.clip(base.astype(np.int16) + ruido, 0, 255).astype(np.uint8)
+    return cor, cv2.cvtColor(cor, cv2.COLOR_BGR2GRAY)
+
+def _candidatos_threads():
+    nucleos = os.cpu_count() or 1
+    candidatos = {1, nucleos}
+    n = 2
+    while n < nucleos:
+        candidatos.add(n)
+        n *= 2
+    return sorted(candidatos)
+
+def ajustar_opencv_threads(cinza, cor):
+    """Threads do OpenCV mais rápidas para filtragem e esboço"""
+    imagem = cinza.astype(np.float32) / 255.0
+    tempos = {}
+    for threads in _candidatos_threads():
+        with configuracao(opencv_threads=threads):
+            tempos[threads] = cronometrar(lambda: (aplicar_filtro(imagem, 'h2'), gerar_esboco(cor)))
+    return min(tempos, key=tempos.get)
+
+def ajustar_faixas(cinza, cor):
+    """Threads e altura de faixa mais rápidas para as operações NumPy em faixas"""
+    cor_float = cor.astype(np.float32) / 255.0
+    tempos = {}
+    for threads in _candidatos_threads():
+        for altura in ([None] if threads == 1 else [None, 64, 256]):
+            with configuracao(threads=threads, altura_faixa=altura, limiar_faixas=1):
+                tempos[(threads, altura)] = cronometrar(
+                    lambda: (ajuste_gamma(cinza, 2.5), aplicar_transformacao_sepia(cor_float)))
+    return min(tempos, key=tempos.get)
+
+def ajustar_limiar(threads, altura):
+    """Menor imagem (em elementos) a partir da qual dividir em faixas compensa"""
+    if threads == 1:
+        return None
+    gerador = np.random.default_rng(1)
+    for expoente in (16, 18, 20, 22):
+        imagem = gerador.integers(0, 256, (1 << (expoente // 2), 1 << (expoente - expoente // 2)),
+                                  dtype=np.uint8)
+        with configuracao(threads=1):
+            serial = cronometrar(lambda: ajuste_gamma(imagem, 2.5))
+        with configuracao(threads=threads, altura_faixa=altura, limiar_faixas=1):
+            paralelo = cronometrar(lambda: ajuste_gamma(imagem, 2.5))
+        if paralelo < serial:
+            return 1 << expoente
+    return None
+
+def ajustar_separavel(cinza):
+    """Tamanhos de núcleo em que sepFilter2D supera filter2D por mais de 5%"""
+    tamanhos = []
+    for filtro_id in ('h3', 'h2'):  # Sobel 3x3 e Gaussiano 5x5
+        kernel = criar_filtro(filtro_id)
+        kx, ky = fatorar_filtro(kernel)
+        espacial = cronometrar(lambda: cv2.filter2D(cinza, -1, kernel))
+        separavel = cronometrar(lambda: cv2.sepFilter2D(cinza, -1, kx, ky))
+        if separavel < 0.95 * espacial:
+            tamanhos.append(kernel.shape[0])
+    return tamanhos
+
+def medir_vazao_disco(megabytes=16):
+    """Vazão de escrita (bytes/s) em disco, com fsync, no diretório temporário"""
+    dados = os.urandom(megabytes << 20)
+    with tempfile.NamedTemporaryFile() as arquivo:
+        inicio = time.perf_counter()
+        arquivo.write(dados)
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+        return len(dados) / (time.perf_counter() - inicio)
+
+def ajustar_png(cor, vazao_disco):
+    """
+    Nível de compressão PNG que minimiza codificação + escrita em disco
+    Returns:
+        Nível de 0 a 9, ou None se nenhum superar o padrão do OpenCV por mais de 5%
+    """
+    def custo(parametros):
+        tempo = cronometrar(lambda: cv2.imencode('.png', cor, parametros))
+        return tempo + len(cv2.imencode('.png', cor, parametros)[1]) / vazao_disco
+
+    padrao = custo([])
+    custos = {nivel: custo([cv2.IMWRITE_PNG_COMPRESSION, nivel]) for nivel in range(10)}
+    melhor = min(custos, key=custos.get)
+    return melhor if custos[melhor] < 0.95 * padrao else None
+
+def comparar_vazao(cinza, cor, vazao_disco, perfil, repeticoes=5):
+    """
+    Megapixels/s de cada operação com a configuração padrão e com o perfil
+    (execuções alternadas, para que variações da máquina afetem os dois lados igualmente;
+    a escrita PNG inclui o tempo estimado de disco)
+    Returns:
+        Tupla (padrao, ajustado) de dicionários operação -> MP/s
+    """
+    megapixels = cinza.size / 1e6
+    imagem = cinza.astype(np.float32) / 255.0
+    cor_float = cor.astype(np.float32) / 255.0
+
+    def salvar_png():
+        return len(cv2.imencode('.png', cor, parametros_escrita('saida.png'))[1])
+
+    operacoes = {
+        'filtro h2': lambda: aplicar_filtro(imagem, 'h2'),
+        'filtro h3': lambda: aplicar_filtro(imagem, 'h3'),
+        'esboço': lambda: gerar_esboco(cor),
+        'gamma': lambda: ajuste_gamma(cinza, 2.5),
+        'sépia': lambda: aplicar_transformacao_sepia(cor_float),
+        'salvar PNG': salvar_png,
+    }
+    padrao, ajustado = {}, {}
+    for nome, operacao in operacoes.items():
+        tempos = {'padrao': float('inf'), 'ajustado': float('inf')}
+        for _ in range(repeticoes):
+            for lado, valores in (('padrao', {}), ('ajustado', perfil)):
+                with configuracao(**valores):
+                    tempo = cronometrar(operacao, 1)
+                    if operacao is salvar_png:
+                        tempo += salvar_png() / vazao_disco
+                    tempos[lado] = min(tempos[lado], tempo)
+        padrao[nome] = megapixels / tempos['padrao']
+        ajustado[nome] = megapixels / tempos['ajustado']
+    return padrao, ajustado
+
+def executar_autoajuste(megapixels=4.0, caminho=None):
+    """Roda todos os ajustes, compara com o padrão, salva o perfil e retorna (perfil, caminho)"""
+    cor, cinza = criar_imagens(megapixels)
+    print(f"Autoajuste com imagens de {megapixels:g} MP em {os.cpu_count()} núcleo(s)...")
+
+    opencv_threads = ajustar_opencv_threads(cinza, cor)
+    print(f"- threads do OpenCV: {opencv_threads} (padrão {_OPENCV_THREADS_PADRAO})")
+    threads, altura_faixa = ajustar_faixas(cinza, cor)
+    print(f"- threads das faixas: {threads}, altura da faixa: {altura_faixa or 'linhas/threads'}")
+    limiar_faixas = ajustar_limiar(threads, altura_faixa)
+    print(f"- limiar para dividir em faixas: {limiar_faixas or 'padrão'}")
+    filtro_separavel = ajustar_separavel(cinza)
+    print(f"- convolução separável para núcleos: {filtro_separavel or 'nenhum'}")
+    vazao_disco = medir_vazao_disco()
+    png_compressao = ajustar_png(cor, vazao_disco)
+    print(f"- compressão PNG: {'padrão' if png_compressao is None else png_compressao} (disco: {vazao_disco / 2**20:.0f} MB/s)")
+
+    perfil = {
+        'opencv_threads': opencv_threads,
+        'threads': threads,
+        'altura_faixa': altura_faixa,
+        'limiar_faixas': limiar_faixas,
+        'filtro_separavel': filtro_separavel,
+        'png_compressao': png_compressao,
+    }
+
+    padrao, ajustado = comparar_vazao(cinza, cor, vazao_disco, perfil)
+
+    print(f"\n{'operação':<12}{'padrão (MP/s)':>15}{'ajustado (MP/s)':>17}{'ganho':>8}")
+    for nome in padrao:
+        print(f"{nome:<12}{padrao[nome]:>15.1f}{ajustado[nome]:>17.1f}{ajustado[nome] / padrao[nome]:>7.2f}x")
+
+    perfil['maquina'] = {'sistema': platform.platform(), 'processador': platform.processor(),
+                         'nucleos': os.cpu_count(), 'opencv': cv2.__version__, 'numpy': np.__version__}
+    perfil['relatorio'] = {'megapixels': megapixels,
+                           'padrao_mp_s': {k: round(v, 2) for k, v in padrao.items()},
+                           'ajustado_mp_s': {k: round(v, 2) for k, v in ajustado.items()}}
+    return perfil, salvar_perfil(perfil, caminho)
@@ -0,0 +1,83 @@
+"""
+Compara as precisões de precisao.py: erro máximo contra float64, tempo e memória de pico.
+
+Uso: python benchmarkPrecisao.py [--megapixels 12] [--repeticoes 3]
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from ajusteDeBrilho import ajuste_gamma
+from combinacaoDeImagens import combinar_imagens
+from esbocoALapis import gerar_esboco
+from execucaoEmFaixas import configurar_threads
+from precisao import PRECISOES
+from transformacaoDeImagensColoridas import (aplicar_transformacao_sepia,
+                                             aplicar_transformacao_monocromatica)
+
+def criar_entradas(megapixels, semente=0):
+    """Imagens sintéticas: ruído uniforme (cobre todas as cores), gradiente suave e região escura"""
+    gerador = np.random.default_rng(semente)
+    lado = int(np.sqrt(megapixels * 1e6))
+    cor = gerador.integers(0, 256, (lado, lado, 3), dtype=np.uint8)
+    cinza = np.add.outer(np.arange(lado), np.arange(lado)) * 255 // (2 * lado - 2)
+    cinza = cinza.astype(np.uint8)
+    # Esboço: ruído com um quadrante escuro de pixels isolados fracos, onde o desfoque
+    # arredonda para 0 (caso de divisão por zero que o ruído uniforme nunca atinge)
+    escura = cor.copy()
+    quadrante = escura[:lado // 2, :lado // 2]
+    quadrante[:] = 0
+    isolados = gerador.random(quadrante.shape[:2]) < 0.002
+    quadrante[isolados] = gerador.integers(1, 31, (int(isolados.sum()), 1), dtype=np.uint8)
+    return {
+        'cor': cor.astype(np.float32) / 255.0,
+        'cor_8bit': cor,
+        'cor_escura_8bit': escura,
+        'cinza': cinza,
+        'cinza_a': cor[..., 0].astype(np.float32) / 255.0,
+        'cinza_b': cor[..., 1].astype(np.float32) / 255.0,
+    }
+
+OPERACOES = {
+    'gamma': lambda e, p: ajuste_gamma(e['cor_8bit'][..., 0], 2.5, p),
+    'sepia': lambda e, p: aplicar_transformacao_sepia(e['cor'], p),
+    'monocromatica': lambda e, p: aplicar_transformacao_monocromatica(e['cor'], p),
+    'combinacao': lambda e, p: combinar_imagens(e['cinza_a'], e['cinza_b'], 0.3, p),
+    'esboco': lambda e, p: gerar_esboco(e['cor_escura_8bit'], p),
+}
+
+def medir(operacao, entradas, precisao, repeticoes):
+    """Retorna (resultado, melhor tempo em s, pico de memória alocada em MB)"""
+    tracemalloc.start()
+    resultado = operacao(entradas, precisao)
+    pico = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        operacao(entradas, precisao)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return resultado, melhor, pico
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark das políticas de precisão')
+    parser.add_argument('--megapixels', type=float, default=12.0, help='Tamanho das imagens sintéticas')
+    parser.add_argument('--repeticoes', type=int, default=3, help='Repetições por medição (vale a melhor)')
+    args = parser.parse_args()
+
+    # Uma thread: mede o custo da precisão, não o paralelismo
+    configurar_threads(1)
+    entradas = criar_entradas(args.megapixels)
+
+    print(f"{'operação':<15}{'precisão':<10}{'erro máx':>9}{'tempo (s)':>11}{'pico (MB)':>11}")
+    for nome, operacao in OPERACOES.items():
+        referencia = None
+        for precisao in PRECISOES:
+            resultado, tempo, pico = medir(operacao, entradas, precisao, args.repeticoes)
+            if referencia is None:
+                referencia = resultado.astype(np.int16)
+            erro = int(np.abs(resultado.astype(np.int16) - referencia).max())
+            print(f"{nome:<15}{precisao:<10}{erro:>9}{tempo:>11.3f}{pico:>11.1f}")
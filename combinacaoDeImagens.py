@@ -1,23 +1,21 @@
-import cv2
 import os
 import argparse
 import numpy as np
 
-def carregar_imagem(caminho_entrada):
-    """Carrega a imagem em tons de cinza e normaliza para float32 no intervalo [0,1]"""
-    imagem = cv2.imread(caminho_entrada, cv2.IMREAD_GRAYSCALE)
-    if imagem is None:
-        print(f"Erro: Não foi possível carregar a imagem {caminho_entrada}!")
-        return None
-    return imagem.astype(np.float32) / 255.0
+from arquivosDeImagem import carregar_imagem, salvar_imagem
+from execucaoEmFaixas import executar_em_faixas
+from perfilDesempenho import aplicar_perfil
+from precisao import obter_precisao, para_float, para_uint8, float_para_uint8
+from sondagemDeImagens import sondar_imagem
 
-def combinar_imagens(imagem_a, imagem_b, peso_a):
+def combinar_imagens(imagem_a, imagem_b, peso_a, precisao=None):
     """
     Combina duas imagens monocromáticas usando média ponderada
     Args:
         imagem_a: primeira imagem normalizada [0,1]
         imagem_b: segunda imagem normalizada [0,1]
         peso_a: peso da imagem A (0 a 1)
+        precisao: float64, float32, float16 ou fixo16 (None = política global, ver precisao.py)
     Returns:
         Imagem combinada em formato uint8 [0,255]
     """
@@ -26,21 +24,35 @@ def combinar_imagens(imagem_a, imagem_b, peso_a):
         print("Erro: As imagens devem ter o mesmo tamanho!")
         return None
     
+    precisao = obter_precisao(precisao)
+    if precisao == 'fixo16' and not 0 <= peso_a <= 1:
+        print("Erro: Em ponto fixo o peso deve estar entre 0 e 1!")
+        return None
+    
+    # Combina em faixas paralelas para imagens grandes
+    return executar_em_faixas(lambda a, b: _combinar(a, b, peso_a, precisao),
+                              (imagem_a, imagem_b), imagem_a.shape)
+
+def _combinar(imagem_a, imagem_b, peso_a, precisao):
+    """Média ponderada de uma faixa das duas imagens"""
+    if precisao == 'fixo16':
+        # Pesos em 8 bits fracionários: 255 * 256 ainda cabe em uint16
+        peso_a_fixo = np.uint16(round(peso_a * 256))
+        combinada = np.multiply(para_uint8(imagem_a), peso_a_fixo, dtype=np.uint16)
+        combinada += np.multiply(para_uint8(imagem_b), np.uint16(256) - peso_a_fixo, dtype=np.uint16)
+        combinada >>= 8
+        return combinada.astype(np.uint8)
+
     # Calcula o peso da imagem B
+    dtype = np.dtype(precisao).type
     peso_b = 1.0 - peso_a
     
     # Combinação ponderada
-    combinada = peso_a * imagem_a + peso_b * imagem_b
+    combinada = dtype(peso_a) * para_float(imagem_a, dtype)
+    combinada += dtype(peso_b) * para_float(imagem_b, dtype)
     
     # Clipa e converte para 8 bits
-    combinada = np.clip(combinada, 0, 1)
-    return (combinada * 255).astype(np.uint8)
-
-def salvar_imagem(caminho_saida, imagem):
-    """Salva a imagem no caminho especificado"""
-    os.makedirs(os.path.dirname(caminho_saida), exist_ok=True)
-    cv2.imwrite(caminho_saida, imagem)
-    print(f"✅ Imagem combinada salva em: {caminho_saida}")
+    return float_para_uint8(combinada)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Combina duas imagens monocromáticas usando média ponderada')
@@ -51,6 +63,7 @@ if __name__ == "__main__":
     parser.add_argument('--saida', '-s', help='Nome personalizado para o arquivo de saída (será salvo na pasta Saídas)', default=None)
     
     args = parser.parse_args()
+    aplicar_perfil()
     
     # Configura caminhos
     pasta_entradas = os.path.join(os.path.dirname(__file__), 'Entradas')
@@ -68,6 +81,12 @@ if __name__ == "__main__":
         nome_saida = f'combinada_{peso_str}A_{nome_base_a}_{nome_base_b}.png'
     caminho_saida = os.path.join(pasta_saidas, nome_saida)
     
+    # Rejeita tamanhos diferentes pelo cabeçalho, antes de decodificar
+    info_a, info_b = sondar_imagem(caminho_entrada_a), sondar_imagem(caminho_entrada_b)
+    if info_a and info_b and (info_a.largura, info_a.altura) != (info_b.largura, info_b.altura):
+        print("Erro: As imagens devem ter o mesmo tamanho!")
+        exit(1)
+    
     # Processa as imagens
     imagem_a = carregar_imagem(caminho_entrada_a)
     imagem_b = carregar_imagem(caminho_entrada_b)
@@ -75,4 +94,4 @@ if __name__ == "__main__":
     if imagem_a is not None and imagem_b is not None:
         imagem_combinada = combinar_imagens(imagem_a, imagem_b, args.peso_a)
         if imagem_combinada is not None:
-            salvar_imagem(caminho_saida, imagem_combinada)
\ No newline at end of file
+            salvar_imagem(caminho_saida, imagem_combinada, 'Imagem combinada salva')
\ No newline at end of file
@@ -1,28 +1,56 @@
 import argparse
 import cv2
 import os
+import numpy as np
 
-def aplicar_esboco_lapis(caminho_entrada, caminho_saida):
+from arquivosDeImagem import carregar_imagem, salvar_imagem
+from perfilDesempenho import aplicar_perfil
+from precisao import obter_precisao
+from regiaoDeInteresse import processar_com_regiao
+
+def gerar_esboco(imagem, precisao=None, regiao=None, cache=None):
+    """
+    Gera o esboço a lápis de uma imagem BGR uint8
+    precisao: float64, float32, float16 ou fixo16 (None = política global, ver precisao.py)
+    regiao: retângulo (x, y, largura, altura) ou máscara da área editada desde a última
+            chamada com o mesmo cache; só ela (mais o raio de 10 px do desfoque) é recalculada
+    cache: dicionário com a saída anterior (ver regiaoDeInteresse.processar_com_regiao)
+    """
+    precisao = obter_precisao(precisao)
+    # Desfoque 21x21: raio de 10 pixels
+    return processar_com_regiao(lambda recorte: _esboco(recorte, precisao),
+                                imagem, regiao, cache, ('esboco', precisao), halo=10)
+
+def _esboco(imagem, precisao):
+    """Esboço de um recorte da imagem"""
+    imagem_cinza = cv2.cvtColor(imagem, cv2.COLOR_BGR2GRAY)
+    imagem_desfocada = cv2.GaussianBlur(imagem_cinza, (21, 21), 0)
+
+    if precisao == 'fixo16':
+        # Divisão inteira do OpenCV com escala, saturada em 8 bits. O OpenCV define x/0 = 0,
+        # enquanto a referência em float dá 255 (x > 0) ou 0 (x = 0): divisor mínimo 1 reproduz isso
+        return cv2.divide(imagem_cinza, np.maximum(imagem_desfocada, 1), scale=255)
+
+    dtype = np.dtype(precisao).type
+    imagem_cinza_float = imagem_cinza.astype(dtype)
+    imagem_desfocada_float = imagem_desfocada.astype(dtype)
+    imagem_desfocada_float += dtype(1e-6)
+    # Em float16 o epsilon é subnormal e x/epsilon estoura para inf; o clip leva a 255
+    with np.errstate(over='ignore'):
+        esboco = np.divide(imagem_cinza_float, imagem_desfocada_float, out=imagem_cinza_float)
+        esboco *= 255
+    return esboco.clip(0, 255, out=esboco).astype('uint8')
+
+def aplicar_esboco_lapis(caminho_entrada, caminho_saida, precisao=None, regiao=None, cache=None):
     try:
         # Processamento da imagem
-        imagem = cv2.imread(caminho_entrada)
+        imagem = carregar_imagem(caminho_entrada, cinza=False, normalizar=False)
         if imagem is None:
-            print(f"Erro: Não foi possível carregar a imagem {caminho_entrada}!")
             return False
 
-        imagem_cinza = cv2.cvtColor(imagem, cv2.COLOR_BGR2GRAY)
-        imagem_desfocada = cv2.GaussianBlur(imagem_cinza, (21, 21), 0)
-        
-        imagem_cinza_float = imagem_cinza.astype('float32')
-        imagem_desfocada_float = imagem_desfocada.astype('float32')
-        esboco = cv2.divide(imagem_cinza_float, imagem_desfocada_float + 1e-6, dtype=cv2.CV_32F)
-        esboco = (esboco * 255).clip(0, 255).astype('uint8')
-        
-        # Cria diretório se não existir (com tratamento de erro)
-        os.makedirs(os.path.dirname(caminho_saida), exist_ok=True)
-        
-        cv2.imwrite(caminho_saida, esboco)
-        return True
+        esboco = gerar_esboco(imagem, precisao, regiao, cache)
+        # A mensagem de sucesso é impressa por quem chama
+        return salvar_imagem(caminho_saida, esboco, None)
         
     except Exception as e:
         print(f"Erro durante o processamento: {str(e)}")
@@ -34,6 +62,7 @@ if __name__ == "__main__":
     parser.add_argument('-s', '--saida', help='Nome do arquivo de saída (pasta "Saidas")', default=None)
     
     args = parser.parse_args()
+    aplicar_perfil()
     
     # Configura caminhos
     pasta_entradas = os.path.join(os.path.dirname(__file__), 'Entradas')
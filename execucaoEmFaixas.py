@@ -0,0 +1,72 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Abaixo deste número de elementos a divisão em faixas custa mais do que rende
+# (ajustável por MC920_LIMIAR_FAIXAS; ver perfilDesempenho.py)
+LIMIAR_ELEMENTOS = 1 << 20
+
+_num_threads = None
+# Um pool por número de threads: tarefas simultâneas do agendador podem pedir tamanhos
+# diferentes (imagens com poucas linhas), e um pool em uso nunca é encerrado
+_pools = {}
+_trava_pools = threading.Lock()
+
+def configurar_threads(num_threads):
+    """Define o número de threads (None = variável MC920_THREADS ou número de núcleos)"""
+    global _num_threads
+    _num_threads = num_threads
+
+def obter_num_threads():
+    """Número de threads efetivo para a execução em faixas"""
+    if _num_threads is not None:
+        return max(1, _num_threads)
+    return max(1, int(os.environ.get('MC920_THREADS', 0)) or os.cpu_count() or 1)
+
+def obter_limiar_elementos():
+    """Número mínimo de elementos para dividir em faixas"""
+    return int(os.environ.get('MC920_LIMIAR_FAIXAS', 0)) or LIMIAR_ELEMENTOS
+
+def obter_altura_faixa():
+    """Linhas por faixa (MC920_ALTURA_FAIXA); None = uma faixa por thread"""
+    return int(os.environ.get('MC920_ALTURA_FAIXA', 0)) or None
+
+def _obter_pool(num_threads):
+    """Reaproveita o mesmo pool entre chamadas (seguro entre threads)"""
+    with _trava_pools:
+        if num_threads not in _pools:
+            _pools[num_threads] = ThreadPoolExecutor(max_workers=num_threads, thread_name_prefix='faixa')
+        return _pools[num_threads]
+
+def executar_em_faixas(operacao, entradas, forma_saida, dtype=np.uint8):
+    """
+    Executa a operação em faixas de linhas em paralelo, escrevendo numa saída compartilhada
+    (as operações NumPy usadas liberam o GIL, então as faixas rodam em núcleos distintos)
+    Args:
+        operacao: função pixel a pixel que recebe faixas das entradas e retorna a faixa de saída
+        entradas: tupla de arrays com o mesmo número de linhas da saída
+        forma_saida: forma da imagem de saída
+        dtype: tipo da imagem de saída
+    Returns:
+        Imagem de saída; imagens pequenas ou 1 thread chamam a operação diretamente
+    """
+    linhas = forma_saida[0]
+    num_threads = min(obter_num_threads(), linhas)
+    if num_threads <= 1 or np.prod(forma_saida) < obter_limiar_elementos():
+        return operacao(*entradas)
+
+    # Faixas menores que linhas / threads cabem melhor no cache e equilibram a carga
+    altura_faixa = obter_altura_faixa()
+    num_faixas = max(num_threads, -(-linhas // altura_faixa)) if altura_faixa else num_threads
+    saida = np.empty(forma_saida, dtype=dtype)
+    limites = np.linspace(0, linhas, num_faixas + 1).astype(int)
+
+    def processar_faixa(i):
+        inicio, fim = limites[i], limites[i + 1]
+        saida[inicio:fim] = operacao(*(entrada[inicio:fim] for entrada in entradas))
+
+    # list() propaga exceções levantadas dentro das threads
+    list(_obter_pool(num_threads).map(processar_faixa, range(num_faixas)))
+    return saida
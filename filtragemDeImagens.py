@@ -1,16 +1,13 @@
 import cv2
 import os
 import argparse
+import threading
 import numpy as np
 from math import sqrt
 
-def carregar_imagem(caminho_entrada):
-    """Carrega a imagem em tons de cinza e normaliza para float32 no intervalo [0,1]"""
-    imagem = cv2.imread(caminho_entrada, cv2.IMREAD_GRAYSCALE)
-    if imagem is None:
-        print(f"Erro: Não foi possível carregar a imagem {caminho_entrada}!")
-        return None
-    return imagem.astype(np.float32) / 255.0
+from arquivosDeImagem import carregar_imagem, salvar_imagem
+from perfilDesempenho import aplicar_perfil, tamanhos_separaveis
+from regiaoDeInteresse import processar_com_regiao
 
 def criar_filtro(filtro_id):
     """Retorna o kernel do filtro especificado"""
@@ -71,31 +68,152 @@ def criar_filtro(filtro_id):
     }
     return filtros.get(filtro_id)
 
-def aplicar_filtro(imagem, filtro_id):
+# Filtros de magnitude do gradiente: operador e explicação
+GRADIENTES_COMBINADOS = {
+    'sobel_combined': ('sobel', "Magnitude do gradiente (Sobel combinado): detecção de bordas em todas as direções"),
+    'prewitt_combined': ('prewitt', "Magnitude do gradiente (Prewitt combinado): detecção de bordas em todas as direções"),
+    'scharr_combined': ('scharr', "Magnitude do gradiente (Scharr combinado): bordas com melhor simetria rotacional"),
+}
+
+# Núcleos de Prewitt (o OpenCV não possui função dedicada como para Sobel/Scharr)
+_PREWITT_X = np.array([[-1, 0, 1], [-1, 0, 1], [-1, 0, 1]], dtype=np.float32)
+_PREWITT_Y = np.ascontiguousarray(_PREWITT_X.T)
+
+# Buffers intermediários reaproveitados entre chamadas, um conjunto por thread
+# (chamadas simultâneas em threads distintas não compartilham memória)
+_buffers_gradiente = threading.local()
+# Recortes de ROI têm formas variadas: limita quantos buffers cada thread guarda
+_MAX_BUFFERS_GRADIENTE = 32
+
+def _obter_buffer(nome, forma, dtype):
+    """
+    Retorna um buffer intermediário da thread atual, criando-o apenas quando a forma muda.
+    Só para uso interno em uma chamada: nunca é devolvido ao chamador.
+    """
+    buffers = getattr(_buffers_gradiente, 'buffers', None)
+    if buffers is None:
+        buffers = _buffers_gradiente.buffers = {}
+    chave = (nome, forma, np.dtype(dtype))
+    buffer = buffers.get(chave)
+    if buffer is None:
+        if len(buffers) >= _MAX_BUFFERS_GRADIENTE:
+            # Seguro: os buffers em uso na chamada atual continuam referenciados por ela
+            buffers.clear()
+        buffer = np.empty(forma, dtype=dtype)
+        buffers[chave] = buffer
+    return buffer
+
+def calcular_gradiente(img_8bit, operador='sobel', modo='l2', orientacao=False):
+    """
+    Calcula a magnitude (e opcionalmente a orientação) do gradiente
+    Args:
+        img_8bit: imagem em tons de cinza uint8 [0,255]
+        operador: 'sobel', 'prewitt' ou 'scharr'
+        modo: 'l2' (sqrt(gx² + gy²)) ou 'l1' (|gx| + |gy|)
+        orientacao: se True, retorna também o ângulo em graus [0,360)
+    Returns:
+        Tupla (magnitude, angulo) de arrays novos; angulo é None se orientacao=False
+    """
+    forma = img_8bit.shape
+
+    # Derivadas em int16: preserva as respostas negativas sem saturar
+    if operador == 'sobel':
+        gx, gy = cv2.spatialGradient(img_8bit, _obter_buffer('gx', forma, np.int16),
+                                     _obter_buffer('gy', forma, np.int16))
+    elif operador == 'scharr':
+        gx = cv2.Scharr(img_8bit, cv2.CV_16S, 1, 0, dst=_obter_buffer('gx', forma, np.int16))
+        gy = cv2.Scharr(img_8bit, cv2.CV_16S, 0, 1, dst=_obter_buffer('gy', forma, np.int16))
+    elif operador == 'prewitt':
+        gx = cv2.filter2D(img_8bit, cv2.CV_16S, _PREWITT_X, dst=_obter_buffer('gx', forma, np.int16))
+        gy = cv2.filter2D(img_8bit, cv2.CV_16S, _PREWITT_Y, dst=_obter_buffer('gy', forma, np.int16))
+    else:
+        raise ValueError(f"Operador de gradiente desconhecido: {operador}")
+
+    if modo == 'l1' and not orientacao:
+        # |gx| + |gy| cabe em int16 para os três operadores (máx. 8160 no Scharr)
+        np.abs(gx, out=gx)
+        np.abs(gy, out=gy)
+        return cv2.add(gx, gy), None
+
+    if modo not in ('l1', 'l2'):
+        raise ValueError(f"Modo de magnitude desconhecido: {modo}")
+
+    # cv2.magnitude/cartToPolar exigem ponto flutuante
+    gx_f = _obter_buffer('gx_f', forma, np.float32)
+    gy_f = _obter_buffer('gy_f', forma, np.float32)
+    np.copyto(gx_f, gx)
+    np.copyto(gy_f, gy)
+    magnitude = np.empty(forma, dtype=np.float32)
+    angulo = None
+
+    if modo == 'l2' and orientacao:
+        angulo = np.empty(forma, dtype=np.float32)
+        cv2.cartToPolar(gx_f, gy_f, magnitude, angulo, angleInDegrees=True)
+    elif modo == 'l2':
+        cv2.magnitude(gx_f, gy_f, magnitude)
+    else:
+        angulo = cv2.phase(gx_f, gy_f, angleInDegrees=True)
+        np.abs(gx_f, out=gx_f)
+        np.abs(gy_f, out=gy_f)
+        cv2.add(gx_f, gy_f, dst=magnitude)
+
+    return magnitude, angulo
+
+def fatorar_filtro(kernel):
+    """
+    Fatora um núcleo de posto 1 em (kx, ky) com kernel = outer(ky, kx), ou None se não for separável.
+    Usa uma linha e uma coluna do próprio núcleo (sem SVD) para manter os coeficientes exatos.
+    """
+    kernel = np.asarray(kernel, dtype=np.float64)
+    i, j = np.unravel_index(np.argmax(np.abs(kernel)), kernel.shape)
+    kx = kernel[i, :]
+    ky = kernel[:, j] / kernel[i, j]
+    if not np.allclose(np.outer(ky, kx), kernel, rtol=0, atol=1e-12):
+        return None
+    return kx, ky
+
+def convoluir(img_8bit, kernel):
+    """filter2D, ou sepFilter2D se o perfil indicar que é mais rápido para este tamanho de núcleo"""
+    if kernel.shape[0] in tamanhos_separaveis():
+        fatores = fatorar_filtro(kernel)
+        if fatores is not None:
+            return cv2.sepFilter2D(img_8bit, -1, *fatores)
+    return cv2.filter2D(img_8bit, -1, kernel)
+
+def _normalizar_minmax(imagem, minimo, maximo):
+    """Equivale a cv2.normalize(..., 0, 255, NORM_MINMAX) com mínimo/máximo conhecidos"""
+    escala = 255.0 / (maximo - minimo) if maximo > minimo else 0.0
+    return cv2.convertScaleAbs(imagem, alpha=escala, beta=-float(minimo) * escala)
+
+def aplicar_filtro(imagem, filtro_id, modo='l2', regiao=None, cache=None):
     """
     Aplica o filtro especificado na imagem
     Args:
         imagem: imagem normalizada [0,1]
-        filtro_id: identificador do filtro (h1 a h11)
+        filtro_id: identificador do filtro (h1 a h11 ou *_combined)
+        modo: norma da magnitude nos filtros *_combined ('l1' ou 'l2')
+        regiao: retângulo (x, y, largura, altura) ou máscara da área editada desde a última
+                chamada com o mesmo cache; só ela (mais o halo do núcleo) é recalculada
+        cache: dicionário com a saída anterior (ver regiaoDeInteresse.processar_com_regiao)
     Returns:
         Imagem filtrada em formato uint8 [0,255] e explicação do filtro
     """
-    img_8bit = (imagem * 255).astype(np.uint8)
+    para_8bit = lambda recorte: (recorte * 255).astype(np.uint8)
     
-    if filtro_id == 'sobel_combined':
-        sobel_x = cv2.filter2D(img_8bit, -1, criar_filtro('h3'))
-        sobel_y = cv2.filter2D(img_8bit, -1, criar_filtro('h4'))
-        combined = np.sqrt(np.square(sobel_x.astype(np.float32)) + 
-                         np.square(sobel_y.astype(np.float32)))
-        combined = cv2.normalize(combined, None, 0, 255, cv2.NORM_MINMAX)
-        return combined.astype(np.uint8), "Magnitude do gradiente (Sobel combinado): detecção de bordas em todas as direções"
+    if filtro_id in GRADIENTES_COMBINADOS:
+        operador, explicacao = GRADIENTES_COMBINADOS[filtro_id]
+        combined = processar_com_regiao(
+            lambda recorte: calcular_gradiente(para_8bit(recorte), operador, modo)[0],
+            imagem, regiao, cache, (filtro_id, modo), halo=1, finalizar=_normalizar_minmax)
+        return combined, explicacao
     
     kernel = criar_filtro(filtro_id)
     if kernel is not None:
-        filtrada = cv2.filter2D(img_8bit, -1, kernel)
-        
-        if filtro_id in ['h1', 'h3', 'h4', 'h5', 'h7', 'h8', 'h11']:
-            filtrada = cv2.normalize(filtrada, None, 0, 255, cv2.NORM_MINMAX)
+        normalizar = filtro_id in ['h1', 'h3', 'h4', 'h5', 'h7', 'h8', 'h11']
+        filtrada = processar_com_regiao(
+            lambda recorte: convoluir(para_8bit(recorte), kernel),
+            imagem, regiao, cache, filtro_id, halo=kernel.shape[0] // 2,
+            finalizar=_normalizar_minmax if normalizar else None)
         
         explicacao = {
             'h1': "Laplaciano modificado: realce de bordas com maior sensibilidade",
@@ -115,35 +233,34 @@ def aplicar_filtro(imagem, filtro_id):
     
     return None, ""
 
-def aplicar_todos_filtros(imagem, pasta_saida, nome_base):
+def aplicar_todos_filtros(imagem, pasta_saida, nome_base, modo='l2'):
     """Aplica todos os filtros e salva os resultados"""
     filtros = ['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'h7', 'h8', 'h9', 'h10', 'h11', 'sobel_combined']
     resultados = []
     
     for filtro in filtros:
-        imagem_filtrada, explicacao = aplicar_filtro(imagem, filtro)
+        imagem_filtrada, explicacao = aplicar_filtro(imagem, filtro, modo)
         if imagem_filtrada is not None:
             caminho_saida = os.path.join(pasta_saida, f'filtrada_{filtro}_{nome_base}.png')
-            salvar_imagem(caminho_saida, imagem_filtrada)
+            salvar_imagem(caminho_saida, imagem_filtrada, None)
             resultados.append((filtro, explicacao))
     
     return resultados
 
-def salvar_imagem(caminho_saida, imagem):
-    """Salva a imagem no caminho especificado"""
-    os.makedirs(os.path.dirname(caminho_saida), exist_ok=True)
-    cv2.imwrite(caminho_saida, imagem)
-
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Aplica filtros em imagens monocromáticas')
     parser.add_argument('entrada', help='Nome da imagem na pasta Entradas (ex: foto.jpg)')
     parser.add_argument('--filtro', '-f', 
                        choices=['all', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'h7', 'h8', 
-                               'h9', 'h10', 'h11', 'sobel_combined'],
+                               'h9', 'h10', 'h11', 'sobel_combined', 'prewitt_combined',
+                               'scharr_combined'],
                        default='all', help='Filtro a ser aplicado (ou "all" para todos)')
+    parser.add_argument('--modo', '-m', choices=['l1', 'l2'], default='l2',
+                        help='Norma da magnitude nos filtros *_combined (l1 = |gx|+|gy|, l2 = euclidiana)')
     parser.add_argument('--saida', '-s', help='Nome personalizado para o arquivo de saída', default=None)
     
     args = parser.parse_args()
+    aplicar_perfil()
     
     # Configura caminhos
     pasta_entradas = os.path.join(os.path.dirname(__file__), 'Entradas')
@@ -157,14 +274,14 @@ if __name__ == "__main__":
         
         if args.filtro == 'all':
             print("Aplicando todos os filtros...")
-            resultados = aplicar_todos_filtros(imagem, pasta_saidas, nome_base)
+            resultados = aplicar_todos_filtros(imagem, pasta_saidas, nome_base, args.modo)
             
             print("\nResumo dos filtros aplicados:")
             for filtro, explicacao in resultados:
                 print(f"- {filtro}: {explicacao}")
             print(f"\n✅ Todas as imagens filtradas foram salvas na pasta 'Saidas'")
         else:
-            imagem_filtrada, explicacao = aplicar_filtro(imagem, args.filtro)
+            imagem_filtrada, explicacao = aplicar_filtro(imagem, args.filtro, args.modo)
             if imagem_filtrada is not None:
                 print(f"Efeito do filtro {args.filtro}: {explicacao}")
                 
@@ -174,5 +291,4 @@ if __name__ == "__main__":
                     nome_saida = f'filtrada_{args.filtro}_{nome_base}.png'
                 
                 caminho_saida = os.path.join(pasta_saidas, nome_saida)
-                salvar_imagem(caminho_saida, imagem_filtrada)
-                print(f"✅ Imagem filtrada salva em: {caminho_saida}")
\ No newline at end of file
+                salvar_imagem(caminho_saida, imagem_filtrada, 'Imagem filtrada salva')
\ No newline at end of file
@@ -0,0 +1,390 @@
+"""
+Ponto de entrada único para todas as operações do trabalho.
+
+Uso: python mc920.py <comando> [opções]   (python mc920.py --help lista os comandos)
+
+Os módulos de processamento (e portanto cv2/numpy) só são importados dentro do
+comando executado, então --help e erros de argumento respondem sem carregar o OpenCV.
+"""
+import argparse
+import os
+import shlex
+import sys
+
+from arquivosDeImagem import carregar_imagem, salvar_imagem
+from sondagemDeImagens import sondar_imagem
+
+PASTA_BASE = os.path.dirname(os.path.abspath(__file__))
+PASTA_ENTRADAS = os.path.join(PASTA_BASE, 'Entradas')
+PASTA_SAIDAS = os.path.join(PASTA_BASE, 'Saidas')
+
+def _entrada(nome):
+    return os.path.join(PASTA_ENTRADAS, nome)
+
+def _saida(args, nome_padrao):
+    """Caminho de saída .png: nome personalizado (--saida) ou o padrão do comando"""
+    if args.saida:
+        return os.path.join(PASTA_SAIDAS, os.path.splitext(args.saida)[0] + '.png')
+    return os.path.join(PASTA_SAIDAS, nome_padrao)
+
+def _base(nome):
+    return os.path.splitext(nome)[0]
+
+# ---------------------------------------------------------------------------
+# Comandos (cada um importa apenas o módulo de que precisa)
+# ---------------------------------------------------------------------------
+
+def cmd_brilho(args):
+    from ajusteDeBrilho import processar_imagem
+    return processar_imagem(_entrada(args.entrada), os.path.join(PASTA_SAIDAS, args.saida or 'brilho'), args.gammas)
+
+def cmd_cores(args):
+    from alteracaoDeCores import aplicar_transformacao_cor
+    imagem = carregar_imagem(_entrada(args.entrada), cinza=False)
+    if imagem is None:
+        return False
+    return salvar_imagem(_saida(args, f'transformada_{_base(args.entrada)}.png'), aplicar_transformacao_cor(imagem))
+
+def cmd_combinar(args):
+    from combinacaoDeImagens import combinar_imagens
+    # Rejeita tamanhos diferentes pelo cabeçalho, antes de decodificar
+    info_a, info_b = sondar_imagem(_entrada(args.entrada_a)), sondar_imagem(_entrada(args.entrada_b))
+    if info_a and info_b and (info_a.largura, info_a.altura) != (info_b.largura, info_b.altura):
+        print("Erro: As imagens devem ter o mesmo tamanho!")
+        return False
+    imagem_a = carregar_imagem(_entrada(args.entrada_a))
+    imagem_b = carregar_imagem(_entrada(args.entrada_b))
+    if imagem_a is None or imagem_b is None:
+        return False
+    combinada = combinar_imagens(imagem_a, imagem_b, args.peso_a)
+    if combinada is None:
+        return False
+    peso_str = str(args.peso_a).replace('.', '_')
+    nome_padrao = f'combinada_{peso_str}A_{_base(args.entrada_a)}_{_base(args.entrada_b)}.png'
+    return salvar_imagem(_saida(args, nome_padrao), combinada)
+
+def cmd_esboco(args):
+    from esbocoALapis import aplicar_esboco_lapis
+    caminho_saida = os.path.join(PASTA_SAIDAS, args.saida or f'esboco_{args.entrada}')
+    if not aplicar_esboco_lapis(_entrada(args.entrada), caminho_saida):
+        return False
+    print(f"✅ Esboço salvo em: {caminho_saida}")
+    return True
+
+def cmd_filtrar(args):
+    from filtragemDeImagens import aplicar_filtro, aplicar_todos_filtros
+    imagem = carregar_imagem(_entrada(args.entrada))
+    if imagem is None:
+        return False
+    nome_base = _base(args.entrada)
+    if args.filtro == 'all':
+        for filtro, explicacao in aplicar_todos_filtros(imagem, PASTA_SAIDAS, nome_base, args.modo):
+            print(f"- {filtro}: {explicacao}")
+        print("✅ Todas as imagens filtradas foram salvas na pasta 'Saidas'")
+        return True
+    imagem_filtrada, explicacao = aplicar_filtro(imagem, args.filtro, args.modo)
+    if imagem_filtrada is None:
+        return False
+    print(f"Efeito do filtro {args.filtro}: {explicacao}")
+    return salvar_imagem(_saida(args, f'filtrada_{args.filtro}_{nome_base}.png'), imagem_filtrada)
+
+def cmd_mosaico(args):
+    from mosaico import criar_mosaico
+    return criar_mosaico(_entrada(args.entrada), _saida(args, f'mosaico_{_base(args.entrada)}.png'))
+
+def cmd_planos(args):
+    from planoDeBits import extrair_planos_bits
+    imagem = carregar_imagem(_entrada(args.entrada))
+    if imagem is None:
+        return False
+    nome_padrao = f'plano_bit_{args.plano}_{_base(args.entrada)}.png'
+    return salvar_imagem(_saida(args, nome_padrao), extrair_planos_bits(imagem, args.plano))
+
+def cmd_quantizar(args):
+    from quantizacaoDeImagens import quantizar_imagem
+    imagem = carregar_imagem(_entrada(args.entrada))
+    if imagem is None:
+        return False
+    quantizada = quantizar_imagem(imagem, args.niveis, args.pontilhamento)
+    if quantizada is None:
+        return False
+    sufixo = f'_{args.pontilhamento}' if args.pontilhamento else ''
+    nome_padrao = f'quantizada_{args.niveis}niveis{sufixo}_{_base(args.entrada)}.png'
+    return salvar_imagem(_saida(args, nome_padrao), quantizada)
+
+def cmd_coloridas(args):
+    from transformacaoDeImagensColoridas import (aplicar_transformacao_sepia,
+                                                  aplicar_transformacao_monocromatica)
+    imagem = carregar_imagem(_entrada(args.entrada), cinza=False)
+    if imagem is None:
+        return False
+    if args.transformacao == 'sepia':
+        transformada = aplicar_transformacao_sepia(imagem)
+    else:
+        transformada = aplicar_transformacao_monocromatica(imagem)
+    nome_padrao = f'transformada_{args.transformacao}_{_base(args.entrada)}.png'
+    return salvar_imagem(_saida(args, nome_padrao), transformada)
+
+def cmd_intensidade(args):
+    from transformacaoDeIntensidade import aplicar_transformacoes
+    imagem = carregar_imagem(_entrada(args.entrada))
+    if imagem is None:
+        return False
+    transformada = aplicar_transformacoes(imagem, args.transformacao)
+    if transformada is None:
+        return False
+    nome_padrao = f'transformada_{args.transformacao}_{_base(args.entrada)}.png'
+    return salvar_imagem(_saida(args, nome_padrao), transformada)
+
+def cmd_lote(args):
+    import processamentoEmLote as lote
+
+    # Valida as entradas antes de criar a pilha de saída no disco
+    pilha = lote.carregar_pilha(args.entrada)
+    if args.operacao == 'combinar':
+        if not args.entrada_b:
+            print("Erro: A operação combinar exige --entrada-b!")
+            return False
+        pilha_b = lote.carregar_pilha(args.entrada_b)
+        if pilha_b.shape != pilha.shape:
+            print(f"Erro: As pilhas devem ter a mesma forma ({pilha.shape} e {pilha_b.shape})!")
+            return False
+    if args.operacao in ('sepia', 'monocromatica') and (pilha.ndim != 4 or pilha.shape[-1] != 3):
+        print(f"Erro: A operação {args.operacao} exige uma pilha BGR (N, H, W, 3), recebida {pilha.shape}!")
+        return False
+
+    saida = lote.criar_pilha_saida(args.saida, pilha.shape)
+    if args.operacao == 'combinar':
+        resultado = lote.combinar_imagens_lote(pilha, pilha_b, args.peso_a, saida, args.bloco)
+    elif args.operacao == 'gamma':
+        resultado = lote.ajuste_gamma_lote(pilha, args.gamma, saida, args.bloco)
+    elif args.operacao == 'quantizar':
+        resultado = lote.quantizar_lote(pilha, args.niveis, saida, args.bloco, args.pontilhamento)
+    elif args.operacao == 'planos':
+        resultado = lote.extrair_planos_bits_lote(pilha, args.plano, saida, args.bloco)
+    elif args.operacao == 'sepia':
+        resultado = lote.aplicar_transformacao_sepia_lote(pilha, saida, args.bloco)
+    else:
+        resultado = lote.aplicar_transformacao_monocromatica_lote(pilha, saida, args.bloco)
+    if resultado is None:
+        # Não deixa no disco uma pilha não inicializada
+        del saida
+        os.remove(args.saida)
+        return False
+    resultado.flush()
+    print(f"✅ Pilha com {pilha.shape[0]} imagens salva em: {args.saida}")
+    return True
+
+def cmd_sondar(args):
+    ok = True
+    for nome in args.entradas:
+        info = sondar_imagem(_entrada(nome))
+        if info is None:
+            print(f"❌ {nome}: formato não reconhecido ou arquivo ilegível")
+            ok = False
+        else:
+            orientacao = f", orientação EXIF {info.orientacao}" if info.orientacao != 1 else ""
+            print(f"{nome}: {info.formato} {info.largura}x{info.altura}, {info.canais} canal(is), "
+                  f"{info.bits} bits{orientacao}")
+    return ok
+
+# Comandos que não fazem sentido dentro de um arquivo de tarefas
+_COMANDOS_NAO_AGENDAVEIS = {'agendar', 'sondar', 'lote', 'autoajuste'}
+
+def cmd_agendar(args):
+    from agendadorDeTarefas import executar_tarefas
+
+    try:
+        with open(args.arquivo, encoding='utf-8') as arquivo:
+            linhas = arquivo.readlines()
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Erro: Não foi possível ler o arquivo de tarefas {args.arquivo}: {str(e)}")
+        return False
+
+    parser = criar_parser()
+    tarefas, invalidas = [], 0
+    for numero, linha in enumerate(linhas, 1):
+        linha = linha.strip()
+        if not linha or linha.startswith('#'):
+            continue
+        try:
+            tarefa_args = parser.parse_args(shlex.split(linha))
+        except SystemExit:
+            print(f"❌ Linha {numero}: argumentos inválidos: {linha}")
+            invalidas += 1
+            continue
+        if tarefa_args.comando in _COMANDOS_NAO_AGENDAVEIS:
+            print(f"❌ Linha {numero}: o comando {tarefa_args.comando} não pode ser agendado")
+            invalidas += 1
+            continue
+        entradas = [getattr(tarefa_args, nome) for nome in ('entrada', 'entrada_a', 'entrada_b')
+                    if hasattr(tarefa_args, nome)]
+        tarefas.append({
+            'nome': linha,
+            'entradas': [_entrada(nome) for nome in entradas],
+            'executar': lambda tarefa_args=tarefa_args: tarefa_args.executar(tarefa_args),
+            'mesmo_tamanho': tarefa_args.comando == 'combinar',
+        })
+
+    orcamento = int(args.orcamento_mb * 2**20) if args.orcamento_mb else None
+    resultado = executar_tarefas(tarefas, orcamento, args.trabalhadores)
+    print(f"Concluídas: {resultado['sucesso']}, falhas: {resultado['falha']}, "
+          f"rejeitadas: {resultado['rejeitadas'] + invalidas}")
+    return resultado['falha'] == 0 and resultado['rejeitadas'] + invalidas == 0
+
+def cmd_autoajuste(args):
+    from autoajuste import executar_autoajuste
+
+    if args.megapixels <= 0:
+        print("Erro: --megapixels deve ser positivo!")
+        return False
+    _, caminho = executar_autoajuste(args.megapixels, args.saida)
+    print(f"✅ Perfil salvo em: {caminho}")
+    return True
+
+# ---------------------------------------------------------------------------
+# Argumentos
+# ---------------------------------------------------------------------------
+
+FILTROS = ['all', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'h7', 'h8', 'h9', 'h10', 'h11',
+           'sobel_combined', 'prewitt_combined', 'scharr_combined']
+
+# Repetido de quantizacaoDeImagens para não importar numpy/cv2 ao montar os argumentos
+PONTILHAMENTOS = ['bayer', 'ruido_azul', 'floyd_steinberg', 'atkinson']
+
+TRANSFORMACOES_INTENSIDADE = ['negativo', 'intervalo', 'inverter_pares',
+                              'reflexao_linhas', 'espelhamento_vertical']
+
+def _adicionar_entrada_saida(sub, ajuda_saida='Nome personalizado para o arquivo de saída (será salvo na pasta Saídas)'):
+    sub.add_argument('entrada', help='Nome da imagem na pasta Entradas (ex: foto.jpg)')
+    sub.add_argument('--saida', '-s', help=ajuda_saida, default=None)
+
+def criar_parser():
+    parser = argparse.ArgumentParser(prog='mc920', description='Operações de processamento de imagens do MC920')
+    parser.add_argument('--threads', type=int, default=None,
+                        help='Threads para a execução em faixas das operações NumPy (padrão: todos os núcleos)')
+    parser.add_argument('--precisao', choices=['float64', 'float32', 'float16', 'fixo16'], default=None,
+                        help='Precisão de cálculo de gamma, sépia, monocromática, combinação e esboço')
+    comandos = parser.add_subparsers(dest='comando', metavar='comando', required=True)
+
+    sub = comandos.add_parser('brilho', help='Correção gamma para ajuste de brilho')
+    _adicionar_entrada_saida(sub, 'Nome base do arquivo de saída (sem extensão)')
+    sub.add_argument('--gammas', '-g', type=float, nargs='+', default=[1.5, 2.5, 3.5],
+                     help='Valores de gamma a aplicar')
+    sub.set_defaults(executar=cmd_brilho)
+
+    sub = comandos.add_parser('cores', help='Transformação de cores por matriz de conversão')
+    _adicionar_entrada_saida(sub)
+    sub.set_defaults(executar=cmd_cores)
+
+    sub = comandos.add_parser('combinar', help='Média ponderada de duas imagens monocromáticas')
+    sub.add_argument('entrada_a', help='Nome da primeira imagem na pasta Entradas')
+    sub.add_argument('entrada_b', help='Nome da segunda imagem na pasta Entradas')
+    sub.add_argument('--peso_a', '-p', type=float, default=0.5, metavar='PESO',
+                     help='Peso da primeira imagem (0 a 1)')
+    sub.add_argument('--saida', '-s', help='Nome personalizado para o arquivo de saída', default=None)
+    sub.set_defaults(executar=cmd_combinar)
+
+    sub = comandos.add_parser('esboco', help='Esboço a lápis')
+    _adicionar_entrada_saida(sub, 'Nome do arquivo de saída (pasta "Saidas")')
+    sub.set_defaults(executar=cmd_esboco)
+
+    sub = comandos.add_parser('filtrar', help='Filtros espaciais h1 a h11 e magnitude do gradiente')
+    _adicionar_entrada_saida(sub)
+    sub.add_argument('--filtro', '-f', choices=FILTROS, default='all',
+                     help='Filtro a ser aplicado (ou "all" para todos)')
+    sub.add_argument('--modo', '-m', choices=['l1', 'l2'], default='l2',
+                     help='Norma da magnitude nos filtros *_combined')
+    sub.set_defaults(executar=cmd_filtrar)
+
+    sub = comandos.add_parser('mosaico', help='Mosaico 4x4 com blocos reordenados')
+    _adicionar_entrada_saida(sub)
+    sub.set_defaults(executar=cmd_mosaico)
+
+    sub = comandos.add_parser('planos', help='Extração de plano de bits')
+    _adicionar_entrada_saida(sub)
+    sub.add_argument('--plano', '-p', type=int, choices=range(0, 8), required=True,
+                     help='Plano de bit a extrair (0 a 7)')
+    sub.set_defaults(executar=cmd_planos)
+
+    sub = comandos.add_parser('quantizar', help='Quantização em níveis de cinza')
+    _adicionar_entrada_saida(sub)
+    sub.add_argument('--niveis', '-n', type=int, choices=[2, 4, 8, 16, 32, 64, 256], required=True,
+                     help='Número de níveis de quantização')
+    sub.add_argument('--pontilhamento', '-d', choices=PONTILHAMENTOS, default=None,
+                     help='Pontilhamento para reduzir bandas (padrão: truncamento simples)')
+    sub.set_defaults(executar=cmd_quantizar)
+
+    sub = comandos.add_parser('coloridas', help='Transformações sépia e monocromática em imagens RGB')
+    _adicionar_entrada_saida(sub)
+    sub.add_argument('--transformacao', '-t', choices=['sepia', 'monocromatica'], default='sepia',
+                     help='Tipo de transformação a ser aplicada')
+    sub.set_defaults(executar=cmd_coloridas)
+
+    sub = comandos.add_parser('intensidade', help='Transformações de intensidade')
+    _adicionar_entrada_saida(sub)
+    sub.add_argument('--transformacao', '-t', choices=TRANSFORMACOES_INTENSIDADE, required=True,
+                     help='Tipo de transformação a aplicar')
+    sub.set_defaults(executar=cmd_intensidade)
+
+    sub = comandos.add_parser('lote', help='Processa uma pilha .npy (N, H, W[, C]) de imagens de mesmo tamanho')
+    sub.add_argument('entrada', help='Arquivo .npy com a pilha de entrada (aberto como memória mapeada)')
+    sub.add_argument('saida', help='Arquivo .npy da pilha de saída uint8')
+    sub.add_argument('--operacao', '-o', required=True,
+                     choices=['gamma', 'quantizar', 'planos', 'combinar', 'sepia', 'monocromatica'])
+    sub.add_argument('--bloco', '-b', type=int, default=None,
+                     help='Imagens por bloco para limitar a memória (padrão: lote inteiro)')
+    sub.add_argument('--gamma', '-g', type=float, default=1.5)
+    sub.add_argument('--niveis', '-n', type=int, choices=[2, 4, 8, 16, 32, 64, 256], default=4)
+    sub.add_argument('--plano', '-p', type=int, choices=range(0, 8), default=0)
+    sub.add_argument('--pontilhamento', '-d', choices=PONTILHAMENTOS, default=None)
+    sub.add_argument('--entrada-b', help='Segunda pilha .npy (operação combinar)')
+    sub.add_argument('--peso_a', type=float, default=0.5, help='Peso da primeira pilha (operação combinar)')
+    sub.set_defaults(executar=cmd_lote)
+
+    sub = comandos.add_parser('sondar', help='Mostra dimensões, canais e bits lendo só o cabeçalho')
+    sub.add_argument('entradas', nargs='+', help='Imagens na pasta Entradas (PNG, JPEG ou TIFF)')
+    sub.set_defaults(executar=cmd_sondar)
+
+    sub = comandos.add_parser('agendar', help='Executa um arquivo de tarefas (um comando por linha)',
+                              description='Cada linha do arquivo é um comando do mc920 (ex: "quantizar '
+                                          'ladygaga.png -n 4"). As entradas são sondadas antes de '
+                                          'decodificar, as maiores rodam primeiro e a memória das '
+                                          'entradas decodificadas ao mesmo tempo respeita o orçamento. As opções '
+                                          'globais (--threads, --precisao) valem para o agendamento inteiro.')
+    sub.add_argument('arquivo', help='Arquivo de tarefas')
+    sub.add_argument('--orcamento-mb', type=float, default=None,
+                     help='MB de entradas decodificadas em processamento ao mesmo tempo, '
+                          'considerando canais e bits (padrão: sem limite)')
+    sub.add_argument('--trabalhadores', '-j', type=int, default=None,
+                     help='Número de tarefas simultâneas (padrão: do ThreadPoolExecutor)')
+    sub.set_defaults(executar=cmd_agendar)
+
+    sub = comandos.add_parser('autoajuste', help='Mede esta máquina e salva o perfil de desempenho',
+                              description='Roda micro-benchmarks para escolher threads do OpenCV, '
+                                          'threads e altura das faixas, convolução separável e '
+                                          'compressão PNG. O perfil é carregado por todos os comandos; '
+                                          'opções explícitas e variáveis MC920_* têm prioridade.')
+    sub.add_argument('--megapixels', type=float, default=4.0,
+                     help='Tamanho das imagens sintéticas dos benchmarks (padrão: 4)')
+    sub.add_argument('--saida', '-s', default=None,
+                     help='Arquivo do perfil (padrão: MC920_PERFIL ou perfil_desempenho.json)')
+    sub.set_defaults(executar=cmd_autoajuste)
+
+    return parser
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    if args.threads is not None:
+        # Lido por execucaoEmFaixas no momento do uso; evita importar numpy aqui
+        os.environ['MC920_THREADS'] = str(args.threads)
+    if args.precisao is not None:
+        os.environ['MC920_PRECISAO'] = args.precisao
+    if args.comando != 'autoajuste':
+        # O autoajuste mede a partir do padrão, sem o perfil anterior
+        from perfilDesempenho import aplicar_perfil
+        aplicar_perfil()
+    return 0 if args.executar(args) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,15 @@
-import cv2
 import os
 import argparse
 import numpy as np
 
+from arquivosDeImagem import carregar_imagem, salvar_imagem
+from perfilDesempenho import aplicar_perfil
+
 def criar_mosaico(caminho_entrada, caminho_saida):
     try:
         # Carrega a imagem em tons de cinza
-        imagem = cv2.imread(caminho_entrada, cv2.IMREAD_GRAYSCALE)
+        imagem = carregar_imagem(caminho_entrada, normalizar=False)
         if imagem is None:
-            print(f"Erro: Não foi possível carregar a imagem {caminho_entrada}!")
             return False
 
         altura, largura = imagem.shape
@@ -35,11 +36,7 @@ def criar_mosaico(caminho_entrada, caminho_saida):
             np.hstack(blocos_reordenados[12:16])
         ])
 
-        # Garante a pasta de saída existe e salva
-        os.makedirs(os.path.dirname(caminho_saida), exist_ok=True)
-        cv2.imwrite(caminho_saida, mosaico)
-        print(f"✅ Mosaico salvo em: {caminho_saida}")
-        return True
+        return salvar_imagem(caminho_saida, mosaico, 'Mosaico salvo')
 
     except Exception as e:
         print(f"❌ Erro: {str(e)}")
@@ -51,6 +48,7 @@ if __name__ == "__main__":
     parser.add_argument('--saida', '-s', help='Nome personalizado para o arquivo de saída (será salvo na pasta Saídas)', default=None)
     
     args = parser.parse_args()
+    aplicar_perfil()
 
     # Configura caminhos
     pasta_entradas = os.path.join(os.path.dirname(__file__), 'Entradas')
@@ -0,0 +1,64 @@
+"""
+Verifica o orçamento de inicialização do mc920.py usando python -X importtime.
+
+Executa o CLI com --help e com um argumento inválido e falha (código 1) se
+cv2/numpy forem importados, se o tempo total de import exceder o orçamento ou se
+o CLI terminar com um código inesperado (ex: ModuleNotFoundError, que não gera
+linha de importtime para o módulo que falhou).
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+CLI = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mc920.py')
+MODULOS_PROIBIDOS = ('cv2', 'numpy')
+
+# Casos que nunca devem carregar o OpenCV: (argumentos, código de saída esperado)
+CASOS = [
+    (['--help'], 0),
+    (['filtrar', '--help'], 0),
+    (['quantizar', 'x.png', '--niveis', '3'], 2),  # erro de argumento do argparse
+]
+
+def medir_imports(argumentos):
+    """
+    Executa o CLI uma vez
+    Returns:
+        Tupla ({modulo_de_topo: tempo_cumulativo_us}, modulos_importados, codigo_de_saida)
+    """
+    processo = subprocess.run([sys.executable, '-X', 'importtime', CLI] + argumentos,
+                              capture_output=True, text=True)
+    tempos = {}
+    modulos = set()
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith('import time:') or 'cumulative' in linha:
+            continue
+        _, cumulativo, nome = linha[len('import time:'):].split('|')
+        modulos.add(nome.strip())
+        # Apenas imports de topo (sem indentação) para não contar tempos duas vezes
+        if not nome[1:].startswith(' '):
+            tempos[nome.strip()] = int(cumulativo)
+    return tempos, modulos, processo.returncode
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Verifica o tempo de import do CLI mc920')
+    parser.add_argument('--orcamento-ms', type=float, default=60.0,
+                        help='Tempo máximo de import (ms) somando os módulos de topo')
+    args = parser.parse_args()
+
+    falhou = False
+    for argumentos, codigo_esperado in CASOS:
+        tempos, modulos, codigo = medir_imports(argumentos)
+        total_ms = sum(tempos.values()) / 1000.0
+        proibidos = sorted({m.split('.')[0] for m in modulos} & set(MODULOS_PROIBIDOS))
+        ok = not proibidos and total_ms <= args.orcamento_ms and codigo == codigo_esperado
+        falhou |= not ok
+        print(f"{'✅' if ok else '❌'} mc920 {' '.join(argumentos)}: {total_ms:.1f} ms "
+              f"(orçamento {args.orcamento_ms:.1f} ms)")
+        if proibidos:
+            print(f"   módulos proibidos importados: {', '.join(proibidos)}")
+        if codigo != codigo_esperado:
+            print(f"   código de saída {codigo} (esperado {codigo_esperado})")
+
+    sys.exit(1 if falhou else 0)
@@ -0,0 +1,71 @@
+"""
+Perfil de desempenho da máquina, gerado por autoajuste.py (python mc920.py autoajuste).
+
+O perfil é um JSON com os parâmetros escolhidos pelos micro-benchmarks. Ao carregá-lo,
+cada valor vira o padrão da variável de ambiente correspondente, então opções explícitas
+(--threads, variáveis já definidas) continuam tendo prioridade.
+"""
+import json
+import os
+
+ARQUIVO_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'perfil_desempenho.json')
+
+# Chave do perfil -> variável de ambiente lida pelos módulos
+VARIAVEIS = {
+    'opencv_threads': 'MC920_OPENCV_THREADS',
+    'threads': 'MC920_THREADS',
+    'altura_faixa': 'MC920_ALTURA_FAIXA',
+    'limiar_faixas': 'MC920_LIMIAR_FAIXAS',
+    'filtro_separavel': 'MC920_FILTRO_SEPARAVEL',
+    'png_compressao': 'MC920_PNG_COMPRESSAO',
+}
+
+def caminho_perfil():
+    """Caminho do perfil: MC920_PERFIL ou perfil_desempenho.json ao lado dos scripts"""
+    return os.environ.get('MC920_PERFIL') or ARQUIVO_PADRAO
+
+def carregar_perfil(caminho=None):
+    """Lê o perfil; retorna {} se não existir ou estiver corrompido"""
+    try:
+        with open(caminho or caminho_perfil(), encoding='utf-8') as arquivo:
+            return json.load(arquivo)
+    except (OSError, ValueError):
+        return {}
+
+def salvar_perfil(perfil, caminho=None):
+    caminho = caminho or caminho_perfil()
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump(perfil, arquivo, indent=2, ensure_ascii=False)
+    return caminho
+
+def _valor_ambiente(valor):
+    if isinstance(valor, (list, tuple)):
+        return ','.join(str(v) for v in valor)
+    return str(valor)
+
+def aplicar_perfil(caminho=None):
+    """
+    Usa o perfil como padrão das variáveis MC920_* e configura as threads do OpenCV.
+    Deve ser chamado na inicialização dos scripts, antes do processamento.
+    """
+    perfil = carregar_perfil(caminho)
+    for chave, variavel in VARIAVEIS.items():
+        if perfil.get(chave) is not None:
+            os.environ.setdefault(variavel, _valor_ambiente(perfil[chave]))
+
+    if os.environ.get('MC920_OPENCV_THREADS'):
+        import cv2
+        cv2.setNumThreads(int(os.environ['MC920_OPENCV_THREADS']))
+    return perfil
+
+def parametros_escrita(caminho_saida):
+    """Parâmetros do cv2.imwrite para o arquivo (nível de compressão PNG do perfil)"""
+    if caminho_saida.lower().endswith('.png') and os.environ.get('MC920_PNG_COMPRESSAO'):
+        import cv2
+        return [cv2.IMWRITE_PNG_COMPRESSION, int(os.environ['MC920_PNG_COMPRESSAO'])]
+    return []
+
+def tamanhos_separaveis():
+    """Tamanhos de núcleo (ex: {3, 5}) para os quais aplicar_filtro usa convolução separável"""
+    valor = os.environ.get('MC920_FILTRO_SEPARAVEL', '')
+    return {int(tamanho) for tamanho in valor.split(',') if tamanho.strip()}
@@ -1,15 +1,9 @@
-import cv2
 import os
 import argparse
 import numpy as np
 
-def carregar_imagem(caminho_entrada):
-    """Carrega a imagem e normaliza para float32 no intervalo [0,1]"""
-    imagem = cv2.imread(caminho_entrada, cv2.IMREAD_GRAYSCALE)  # Carrega diretamente em tons de cinza
-    if imagem is None:
-        print(f"Erro: Não foi possível carregar a imagem {caminho_entrada}!")
-        return None
-    return imagem.astype(np.float32) / 255.0
+from arquivosDeImagem import carregar_imagem, salvar_imagem
+from perfilDesempenho import aplicar_perfil
 
 def extrair_planos_bits(imagem, plano):
     """
@@ -34,12 +28,6 @@ def extrair_planos_bits(imagem, plano):
     
     return plano_bit.astype(np.uint8)
 
-def salvar_imagem(caminho_saida, imagem):
-    """Salva a imagem no caminho especificado"""
-    os.makedirs(os.path.dirname(caminho_saida), exist_ok=True)
-    cv2.imwrite(caminho_saida, imagem)
-    print(f"✅ Imagem transformada salva em: {caminho_saida}")
-
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Extrai planos de bits de uma imagem monocromática')
     parser.add_argument('entrada', help='Nome da imagem na pasta Entradas (ex: foto.jpg)')
@@ -48,6 +36,7 @@ if __name__ == "__main__":
     parser.add_argument('--saida', '-s', help='Nome personalizado para o arquivo de saída (será salvo na pasta Saídas)', default=None)
     
     args = parser.parse_args()
+    aplicar_perfil()
     
     # Configura caminhos
     pasta_entradas = os.path.join(os.path.dirname(__file__), 'Entradas')
@@ -66,4 +55,4 @@ if __name__ == "__main__":
     imagem = carregar_imagem(caminho_entrada)
     if imagem is not None:
         plano_bit = extrair_planos_bits(imagem, args.plano)
-        salvar_imagem(caminho_saida, plano_bit)
\ No newline at end of file
+        salvar_imagem(caminho_saida, plano_bit, 'Imagem transformada salva')
\ No newline at end of file
@@ -0,0 +1,96 @@
+"""
+Política de precisão numérica para as operações que realmente precisam de ponto flutuante
+(gamma, matriz sépia/monocromática, combinação e divisão do esboço a lápis).
+
+Precisões disponíveis e erro máximo, em níveis de cinza da saída uint8, medido
+contra a referência float64 com benchmarkPrecisao.py (12 MP, todas as cores; o esboço
+usa uma região escura onde o desfoque arredonda para 0):
+
+    precisão  bytes/amostra  gamma  sépia  monocromática  combinação  esboço
+    float64   8              0      0      0              0           0
+    float32   4 (padrão)     0      1      1              1           1
+    float16   2              1      1      1              1           1
+    fixo16    1-2 (inteiro)  0      2      1              1           1
+
+No fixo16 a gamma usa uma tabela de 256 entradas calculada em float64, a combinação
+usa pesos com 8 bits fracionários, a sépia/monocromática coeficientes com 7-8 bits e o
+esboço a divisão inteira saturada do OpenCV com divisor mínimo 1 (o OpenCV faria x/0 = 0).
+O float16 reduz a memória, mas o NumPy não tem aritmética float16 nativa na CPU, então
+costuma ser mais lento que o float32.
+"""
+import os
+
+import numpy as np
+
+PRECISOES = ('float64', 'float32', 'float16', 'fixo16')
+PRECISAO_PADRAO = 'float32'
+
+_precisao = None
+
+def configurar_precisao(precisao):
+    """Define a precisão global (None = variável MC920_PRECISAO ou o padrão float32)"""
+    global _precisao
+    if precisao is not None and precisao not in PRECISOES:
+        raise ValueError(f"Precisão desconhecida: {precisao}")
+    _precisao = precisao
+
+def obter_precisao(precisao=None):
+    """Resolve a precisão efetiva: argumento explícito > configuração global > ambiente > padrão"""
+    precisao = precisao or _precisao or os.environ.get('MC920_PRECISAO') or PRECISAO_PADRAO
+    if precisao not in PRECISOES:
+        raise ValueError(f"Precisão desconhecida: {precisao}")
+    return precisao
+
+def para_uint8(imagem):
+    """Imagem normalizada [0,1] para uint8 (truncando, como no resto do projeto)"""
+    if imagem.dtype == np.uint8:
+        return imagem
+    return (imagem * 255).astype(np.uint8)
+
+def para_float(imagem, dtype):
+    """Imagem (uint8 ou normalizada [0,1]) para o dtype de cálculo, sem cópia se já estiver nele"""
+    if imagem.dtype == np.uint8:
+        return imagem.astype(dtype) / dtype(255.0)
+    return imagem.astype(dtype, copy=False)
+
+def float_para_uint8(imagem):
+    """Clipa em [0,1] e converte para uint8, reaproveitando o buffer de ponto flutuante"""
+    np.clip(imagem, 0, 1, out=imagem)
+    imagem *= 255
+    return imagem.astype(np.uint8)
+
+def transformacao_linear(imagem, matriz, precisao=None):
+    """
+    Aplica saida[..., k] = sum_c matriz[k, c] * imagem[..., c] na precisão escolhida
+    Args:
+        imagem: imagem (..., C) uint8 ou normalizada [0,1]
+        matriz: coeficientes (K, C) não negativos
+        precisao: uma de PRECISOES (None = global)
+    Returns:
+        Imagem (..., K) uint8 [0,255]
+    """
+    precisao = obter_precisao(precisao)
+    matriz = np.asarray(matriz, dtype=np.float64)
+
+    if precisao != 'fixo16':
+        dtype = np.dtype(precisao).type
+        return float_para_uint8(np.dot(para_float(imagem, dtype), matriz.T.astype(dtype)))
+
+    # Ponto fixo: coeficientes escalados por 2^deslocamento de forma que a soma caiba em uint16
+    imagem_8bit = para_uint8(imagem)
+    soma_maxima = 255 * matriz.sum(axis=1).max()
+    deslocamento = min(15, int(np.floor(np.log2(np.iinfo(np.uint16).max / soma_maxima))))
+    coeficientes = np.round(matriz * (1 << deslocamento)).astype(np.uint16)
+
+    saida = np.empty(imagem_8bit.shape[:-1] + (matriz.shape[0],), dtype=np.uint8)
+    acumulador = np.empty(imagem_8bit.shape[:-1], dtype=np.uint16)
+    produto = np.empty_like(acumulador)
+    for k in range(matriz.shape[0]):
+        np.multiply(imagem_8bit[..., 0], coeficientes[k, 0], out=acumulador, dtype=np.uint16)
+        for c in range(1, matriz.shape[1]):
+            np.multiply(imagem_8bit[..., c], coeficientes[k, c], out=produto, dtype=np.uint16)
+            acumulador += produto
+        acumulador >>= deslocamento
+        np.minimum(acumulador, 255, out=acumulador)
+        saida[..., k] = acumulador
+    return saida
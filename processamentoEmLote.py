@@ -0,0 +1,86 @@
+import numpy as np
+
+from ajusteDeBrilho import ajuste_gamma
+from combinacaoDeImagens import combinar_imagens
+from planoDeBits import extrair_planos_bits
+from precisao import para_uint8
+from quantizacaoDeImagens import quantizar_imagem
+from transformacaoDeImagensColoridas import (aplicar_transformacao_sepia,
+                                             aplicar_transformacao_monocromatica)
+
+def carregar_pilha(caminho_npy):
+    """Abre uma pilha (N, H, W[, C]) salva com np.save como memória mapeada (somente leitura)"""
+    return np.load(caminho_npy, mmap_mode='r')
+
+def criar_pilha_saida(caminho_npy, forma):
+    """Cria a pilha de saída uint8 como memória mapeada em disco"""
+    return np.lib.format.open_memmap(caminho_npy, mode='w+', dtype=np.uint8, shape=forma)
+
+def _normalizar(bloco):
+    """Converte um bloco uint8 para float32 [0,1]; blocos já normalizados passam direto"""
+    if bloco.dtype == np.uint8:
+        return bloco.astype(np.float32) / 255.0
+    return bloco
+
+def _processar_em_blocos(operacao, pilhas, forma_saida, saida=None, tamanho_bloco=None):
+    """
+    Aplica a operação vetorizada sobre blocos de imagens consecutivas
+    (pilhas uint8 são normalizadas bloco a bloco, então só um bloco vive em float)
+    Args:
+        operacao: função que recebe fatias (n, H, W[, C]) das pilhas e retorna uint8
+        pilhas: lista de pilhas de entrada com o mesmo N (arrays ou memória mapeada)
+        forma_saida: forma da pilha de saída
+        saida: pilha uint8 pré-alocada (opcional); criada se None
+        tamanho_bloco: imagens por bloco; None processa o lote inteiro de uma vez
+    Returns:
+        Pilha de saída uint8 ou None em caso de erro
+    """
+    if saida is None:
+        saida = np.empty(forma_saida, dtype=np.uint8)
+    elif saida.shape != tuple(forma_saida) or saida.dtype != np.uint8:
+        print(f"Erro: A saída deve ser uint8 com forma {tuple(forma_saida)}!")
+        return None
+
+    total = pilhas[0].shape[0]
+    passo = max(1, tamanho_bloco or total)
+    for inicio in range(0, total, passo):
+        fim = min(inicio + passo, total)
+        saida[inicio:fim] = operacao(*(pilha[inicio:fim] for pilha in pilhas))
+    return saida
+
+def ajuste_gamma_lote(pilha, gamma, saida=None, tamanho_bloco=None):
+    """Correção gamma em uma pilha (N, H, W) uint8 ou normalizada [0,1]"""
+    # ajuste_gamma espera uint8 (o caminho fixo16 indexa uma tabela com os pixels)
+    return _processar_em_blocos(lambda bloco: ajuste_gamma(para_uint8(bloco), gamma),
+                                [pilha], pilha.shape, saida, tamanho_bloco)
+
+def quantizar_lote(pilha, niveis, saida=None, tamanho_bloco=None, pontilhamento=None):
+    """Quantização (com pontilhamento opcional) de uma pilha (N, H, W) uint8 ou normalizada [0,1]"""
+    if niveis < 2 or niveis > 256 or not (niveis & (niveis - 1) == 0):
+        print("Erro: O número de níveis deve ser potência de 2 entre 2 e 256!")
+        return None
+    return _processar_em_blocos(lambda bloco: quantizar_imagem(_normalizar(bloco), niveis, pontilhamento),
+                                [pilha], pilha.shape, saida, tamanho_bloco)
+
+def extrair_planos_bits_lote(pilha, plano, saida=None, tamanho_bloco=None):
+    """Extração do plano de bits de uma pilha (N, H, W) uint8 ou normalizada [0,1]"""
+    return _processar_em_blocos(lambda bloco: extrair_planos_bits(_normalizar(bloco), plano),
+                                [pilha], pilha.shape, saida, tamanho_bloco)
+
+def combinar_imagens_lote(pilha_a, pilha_b, peso_a, saida=None, tamanho_bloco=None):
+    """Média ponderada, par a par, de duas pilhas (N, H, W) uint8 ou normalizadas [0,1]"""
+    if pilha_a.shape != pilha_b.shape:
+        print("Erro: As pilhas devem ter a mesma forma!")
+        return None
+    return _processar_em_blocos(lambda a, b: combinar_imagens(_normalizar(a), _normalizar(b), peso_a),
+                                [pilha_a, pilha_b], pilha_a.shape, saida, tamanho_bloco)
+
+def aplicar_transformacao_sepia_lote(pilha, saida=None, tamanho_bloco=None):
+    """Sépia em uma pilha BGR (N, H, W, 3) uint8 ou normalizada [0,1]"""
+    return _processar_em_blocos(lambda bloco: aplicar_transformacao_sepia(_normalizar(bloco)),
+                                [pilha], pilha.shape, saida, tamanho_bloco)
+
+def aplicar_transformacao_monocromatica_lote(pilha, saida=None, tamanho_bloco=None):
+    """Monocromática em uma pilha BGR (N, H, W, 3) uint8 ou normalizada [0,1]"""
+    return _processar_em_blocos(lambda bloco: aplicar_transformacao_monocromatica(_normalizar(bloco)),
+                                [pilha], pilha.shape, saida, tamanho_bloco)
@@ -1,25 +1,181 @@
-import cv2
 import os
 import argparse
 import numpy as np
+from functools import lru_cache
 
-def carregar_imagem(caminho_entrada):
-    """Carrega a imagem em tons de cinza e normaliza para float32 no intervalo [0,1]"""
-    imagem = cv2.imread(caminho_entrada, cv2.IMREAD_GRAYSCALE)
-    if imagem is None:
-        print(f"Erro: Não foi possível carregar a imagem {caminho_entrada}!")
-        return None
-    return imagem.astype(np.float32) / 255.0
+from arquivosDeImagem import carregar_imagem, salvar_imagem
+from execucaoEmFaixas import executar_em_faixas
+from perfilDesempenho import aplicar_perfil
+
+PONTILHAMENTOS = ['bayer', 'ruido_azul', 'floyd_steinberg', 'atkinson']
+
+# Difusão de erro: (deslocamento em linhas, deslocamento em colunas, peso)
+DIFUSAO_ERRO = {
+    'floyd_steinberg': [(0, 1, 7/16), (1, -1, 3/16), (1, 0, 5/16), (1, 1, 1/16)],
+    'atkinson': [(0, 1, 1/8), (0, 2, 1/8), (1, -1, 1/8), (1, 0, 1/8), (1, 1, 1/8), (2, 0, 1/8)],
+}
 
-def quantizar_imagem(imagem, niveis):
+def quantizar_imagem(imagem, niveis, pontilhamento=None):
     """
     Quantiza a imagem para um número específico de níveis de cinza
     Args:
-        imagem: imagem normalizada [0,1]
+        imagem: imagem normalizada [0,1] (H, W) ou pilha (N, H, W)
         niveis: número de níveis de quantização (2, 4, 8, 16, 32, 64, 256)
+        pontilhamento: None (truncamento), 'bayer' ou 'ruido_azul' (ordenado) ou
+                       'floyd_steinberg' ou 'atkinson' (difusão de erro)
     Returns:
         Imagem quantizada em formato uint8 [0,255]
     """
+    if niveis < 2 or niveis > 256 or not (niveis & (niveis - 1) == 0):
+        print("Erro: O número de níveis deve ser potência de 2 entre 2 e 256!")
+        return None
+    
+    if pontilhamento is not None and pontilhamento not in PONTILHAMENTOS:
+        print(f"Erro: Pontilhamento desconhecido: {pontilhamento}")
+        return None
+    
+    if pontilhamento is None or niveis == 256:
+        # Quantiza em faixas paralelas para imagens grandes
+        return executar_em_faixas(lambda faixa: _quantizar(faixa, niveis), (imagem,), imagem.shape)
+    
+    img_8bit = (imagem * 255).astype(np.uint8)
+    if pontilhamento in DIFUSAO_ERRO:
+        if img_8bit.ndim > 2:
+            return np.stack([_difundir_erro(img, niveis, pontilhamento) for img in img_8bit])
+        return _difundir_erro(img_8bit, niveis, pontilhamento)
+    
+    if pontilhamento == 'bayer':
+        limiares = matriz_bayer(8)
+    else:
+        limiares = matriz_ruido_azul()
+    return _pontilhamento_ordenado(img_8bit, niveis, limiares)
+
+def _passo_niveis(niveis):
+    """Distância entre níveis de saída: múltiplos de 256/niveis, ou {0, 255} com 2 níveis"""
+    return 255.0 if niveis == 2 else 256.0 / niveis
+
+def matriz_bayer(ordem):
+    """Matriz de Bayer ordem x ordem (potência de 2) com limiares em (0, 1)"""
+    matriz = np.zeros((1, 1))
+    while matriz.shape[0] < ordem:
+        matriz = np.block([[4 * matriz, 4 * matriz + 2],
+                           [4 * matriz + 3, 4 * matriz + 1]])
+    return ((matriz + 0.5) / matriz.size).astype(np.float32)
+
+@lru_cache(maxsize=None)
+def matriz_ruido_azul(tamanho=32, sigma=1.5, semente=0):
+    """
+    Matriz de limiares com ruído azul (void-and-cluster de Ulichney), gerada uma vez por processo
+    Returns:
+        Matriz tamanho x tamanho com limiares em (0, 1)
+    """
+    total = tamanho * tamanho
+    distancia = np.minimum(np.arange(tamanho), tamanho - np.arange(tamanho))
+    nucleo = np.exp(-(distancia[:, None] ** 2 + distancia[None, :] ** 2) / (2 * sigma ** 2))
+
+    # Energia de cada pixel = convolução toroidal do padrão com a gaussiana,
+    # atualizada incrementalmente a cada pixel ligado/desligado
+    def nucleo_em(indice):
+        return np.roll(nucleo, divmod(indice, tamanho), axis=(0, 1)).ravel()
+
+    def maior_cluster(padrao, energia):
+        return np.argmax(np.where(padrao, energia, -np.inf))
+
+    def maior_vazio(padrao, energia):
+        return np.argmin(np.where(padrao, np.inf, energia))
+
+    gerador = np.random.default_rng(semente)
+    padrao = np.zeros(total, dtype=bool)
+    padrao[gerador.choice(total, total // 10, replace=False)] = True
+    energia = np.real(np.fft.ifft2(np.fft.fft2(padrao.reshape(tamanho, tamanho)) * np.fft.fft2(nucleo))).ravel()
+
+    # Redistribui o padrão inicial até o maior cluster coincidir com o maior vazio
+    for _ in range(total):
+        cluster = maior_cluster(padrao, energia)
+        padrao[cluster] = False
+        energia -= nucleo_em(cluster)
+        vazio = maior_vazio(padrao, energia)
+        padrao[vazio] = True
+        energia += nucleo_em(vazio)
+        if vazio == cluster:
+            break
+
+    postos = np.zeros(total)
+    padrao_inicial, energia_inicial = padrao.copy(), energia.copy()
+    uns = int(padrao.sum())
+
+    # Fase 1: remove os clusters do padrão inicial, do maior posto para o menor
+    for posto in range(uns - 1, -1, -1):
+        cluster = maior_cluster(padrao, energia)
+        padrao[cluster] = False
+        energia -= nucleo_em(cluster)
+        postos[cluster] = posto
+
+    # Fases 2 e 3: preenche os maiores vazios até completar a matriz
+    padrao, energia = padrao_inicial, energia_inicial
+    for posto in range(uns, total):
+        vazio = maior_vazio(padrao, energia)
+        padrao[vazio] = True
+        energia += nucleo_em(vazio)
+        postos[vazio] = posto
+
+    return ((postos + 0.5) / total).reshape(tamanho, tamanho).astype(np.float32)
+
+def _pontilhamento_ordenado(img_8bit, niveis, limiares):
+    """Pontilhamento ordenado: soma a matriz de limiares repetida em mosaico e trunca"""
+    altura, largura = img_8bit.shape[-2:]
+    n = limiares.shape[0]
+    mosaico = np.tile(limiares, (-(-altura // n), -(-largura // n)))[:altura, :largura]
+    passo = _passo_niveis(niveis)
+    indices = img_8bit * np.float32(1 / passo)
+    indices += mosaico
+    np.floor(indices, out=indices)
+    np.clip(indices, 0, niveis - 1, out=indices)
+    indices *= np.float32(passo)
+    return indices.astype(np.uint8)
+
+def _difundir_erro(img_8bit, niveis, metodo):
+    """
+    Difusão de erro por frentes de onda: o pixel (y, x) só depende de pixels com
+    x + 2y menor, então cada frente x + 2y = t é processada de uma vez. Na imagem
+    achatada com bordas, uma frente é uma fatia com passo (largura - 2), sem cópias.
+    """
+    altura, largura = img_8bit.shape
+    margem = 2
+    largura_total = largura + 2 * margem
+    buffer = np.zeros((altura + margem, largura_total), dtype=np.float32)
+    buffer[:altura, margem:margem + largura] = img_8bit
+    plano = buffer.ravel()
+    saida = np.empty(altura * largura, dtype=np.uint8)
+
+    passo = _passo_niveis(niveis)
+    deslocamentos = [(dy * largura_total + dx, np.float32(peso)) for dy, dx, peso in DIFUSAO_ERRO[metodo]]
+    passo_frente = largura_total - 2
+    passo_saida = largura - 2
+    # Larguras < 3 têm no máximo um pixel por frente: qualquer passo positivo serve
+    passo_fatia_saida = max(1, passo_saida)
+
+    for t in range(largura + 2 * (altura - 1)):
+        # Linhas da frente t: 0 <= t - 2y < largura
+        y_inicio = max(0, (t - largura) // 2 + 1)
+        y_fim = min(altura - 1, t // 2)
+        if y_inicio > y_fim:
+            continue
+        inicio = y_inicio * passo_frente + t + margem
+        frente = slice(inicio, y_fim * passo_frente + t + margem + 1, passo_frente)
+
+        valores = plano[frente]
+        quantizados = np.clip(np.rint(valores * np.float32(1 / passo)), 0, niveis - 1) * np.float32(passo)
+        erro = valores - quantizados
+        inicio_saida = y_inicio * passo_saida + t
+        saida[inicio_saida:y_fim * passo_saida + t + 1:passo_fatia_saida] = quantizados
+        for deslocamento, peso in deslocamentos:
+            plano[inicio + deslocamento:frente.stop + deslocamento:passo_frente] += erro * peso
+
+    return saida.reshape(altura, largura)
+
+def _quantizar(imagem, niveis):
+    """Quantização uniforme de uma faixa da imagem"""
     # Converte para valores de 8 bits (0-255)
     img_8bit = (imagem * 255).astype(np.uint8)
     
@@ -27,10 +183,6 @@ def quantizar_imagem(imagem, niveis):
     if niveis == 256:
         return img_8bit  # Sem quantização
     
-    if niveis < 2 or niveis > 256 or not (niveis & (niveis - 1) == 0):
-        print("Erro: O número de níveis deve ser potência de 2 entre 2 e 256!")
-        return None
-    
     # Calcula o fator de quantização
     fator = 256 / niveis
     
@@ -43,21 +195,18 @@ def quantizar_imagem(imagem, niveis):
     
     return quantizada.astype(np.uint8)
 
-def salvar_imagem(caminho_saida, imagem):
-    """Salva a imagem no caminho especificado"""
-    os.makedirs(os.path.dirname(caminho_saida), exist_ok=True)
-    cv2.imwrite(caminho_saida, imagem)
-    print(f"✅ Imagem quantizada salva em: {caminho_saida}")
-
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Quantiza uma imagem monocromática em diferentes níveis de cinza')
     parser.add_argument('entrada', help='Nome da imagem na pasta Entradas (ex: foto.jpg)')
     parser.add_argument('--niveis', '-n', type=int, 
                         choices=[2, 4, 8, 16, 32, 64, 256],
                         required=True, help='Número de níveis de quantização (2, 4, 8, 16, 32, 64, 256)')
+    parser.add_argument('--pontilhamento', '-d', choices=PONTILHAMENTOS, default=None,
+                        help='Pontilhamento para reduzir bandas (padrão: truncamento simples)')
     parser.add_argument('--saida', '-s', help='Nome personalizado para o arquivo de saída', default=None)
     
     args = parser.parse_args()
+    aplicar_perfil()
     
     # Configura caminhos
     pasta_entradas = os.path.join(os.path.dirname(__file__), 'Entradas')
@@ -69,12 +218,13 @@ if __name__ == "__main__":
         nome_saida = os.path.splitext(args.saida)[0] + '.png'
     else:
         nome_base = os.path.splitext(args.entrada)[0]
-        nome_saida = f'quantizada_{args.niveis}niveis_{nome_base}.png'
+        sufixo = f'_{args.pontilhamento}' if args.pontilhamento else ''
+        nome_saida = f'quantizada_{args.niveis}niveis{sufixo}_{nome_base}.png'
     caminho_saida = os.path.join(pasta_saidas, nome_saida)
     
     # Processa a imagem
     imagem = carregar_imagem(caminho_entrada)
     if imagem is not None:
-        imagem_quantizada = quantizar_imagem(imagem, args.niveis)
+        imagem_quantizada = quantizar_imagem(imagem, args.niveis, args.pontilhamento)
         if imagem_quantizada is not None:
-            salvar_imagem(caminho_saida, imagem_quantizada)
\ No newline at end of file
+            salvar_imagem(caminho_saida, imagem_quantizada, 'Imagem quantizada salva')
\ No newline at end of file
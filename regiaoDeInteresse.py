@@ -0,0 +1,101 @@
+import cv2
+import numpy as np
+
+def retangulo_da_regiao(regiao, forma):
+    """
+    Converte a região editada em limites (y0, y1, x0, x1) dentro da imagem
+    Args:
+        regiao: retângulo (x, y, largura, altura) ou máscara com a forma (H, W) da imagem
+        forma: forma da imagem
+    Returns:
+        Limites recortados à imagem, ou None se a região for vazia
+    """
+    altura, largura = forma[:2]
+    if isinstance(regiao, np.ndarray) and regiao.shape == (altura, largura):
+        x, y, w, h = cv2.boundingRect(regiao.astype(np.uint8))
+    else:
+        x, y, w, h = regiao
+    y0, y1 = max(0, y), min(altura, y + h)
+    x0, x1 = max(0, x), min(largura, x + w)
+    if y0 >= y1 or x0 >= x1:
+        return None
+    return y0, y1, x0, x1
+
+def expandir_retangulo(retangulo, margem, forma):
+    """Expande os limites por uma margem, sem sair da imagem"""
+    y0, y1, x0, x1 = retangulo
+    return (max(0, y0 - margem), min(forma[0], y1 + margem),
+            max(0, x0 - margem), min(forma[1], x1 + margem))
+
+def _fatia(retangulo):
+    y0, y1, x0, x1 = retangulo
+    return np.s_[y0:y1, x0:x1]
+
+def processar_com_regiao(calcular, imagem, regiao=None, cache=None, chave=None, halo=0, finalizar=None):
+    """
+    Executa uma operação local reprocessando só a região editada quando há saída em cache
+    Args:
+        calcular: função recorte -> resultado bruto com a mesma altura e largura do recorte
+        imagem: imagem de entrada completa (já com a edição)
+        regiao: retângulo (x, y, largura, altura) ou máscara da área editada; None = imagem toda
+        cache: dicionário preenchido/atualizado com a saída anterior; None desativa o cache
+        chave: identifica a operação e seus parâmetros (o cache é descartado se mudar)
+        halo: raio do núcleo; a saída muda até halo pixels além da edição e o recorte
+              de entrada precisa de mais halo pixels para que as bordas fiquem exatas
+        finalizar: função (bruta, minimo, maximo) -> saída, para operações com
+                   normalização global; None se o resultado bruto já for a saída
+    Returns:
+        Saída completa. Com cache, é o próprio array guardado no cache
+        (ele é alterado in-place pelas próximas chamadas)
+    """
+    forma = imagem.shape[:2]
+    valido = (cache is not None and regiao is not None
+              and cache.get('chave') == chave and cache.get('forma') == forma)
+
+    if not valido:
+        bruta = calcular(imagem)
+        minimo, maximo = (bruta.min(), bruta.max()) if finalizar else (None, None)
+        saida = finalizar(bruta, minimo, maximo) if finalizar else bruta
+        if cache is not None:
+            # Cópias: calcular/finalizar podem devolver buffers reaproveitados
+            cache.clear()
+            cache.update(chave=chave, forma=forma, saida=np.array(saida), minimo=minimo, maximo=maximo,
+                         bruta=np.array(bruta) if finalizar else None)
+            return cache['saida']
+        return saida
+
+    retangulo = retangulo_da_regiao(regiao, forma)
+    if retangulo is None:
+        return cache['saida']
+
+    # Saída afetada: edição + halo; entrada necessária: edição + 2 * halo
+    afetado = expandir_retangulo(retangulo, halo, forma)
+    entrada = expandir_retangulo(retangulo, 2 * halo, forma)
+    bruta_recorte = calcular(imagem[_fatia(entrada)])
+    interno = (afetado[0] - entrada[0], afetado[1] - entrada[0],
+               afetado[2] - entrada[2], afetado[3] - entrada[2])
+    nova = bruta_recorte[_fatia(interno)]
+
+    if finalizar is None:
+        cache['saida'][_fatia(afetado)] = nova
+        return cache['saida']
+
+    # Atualiza mínimo/máximo globais; só varre a imagem toda se o extremo antigo saiu da região
+    bruta = cache['bruta']
+    antiga = bruta[_fatia(afetado)]
+    minimo, maximo = cache['minimo'], cache['maximo']
+    varrer = ((antiga.min() == minimo and nova.min() > minimo) or
+              (antiga.max() == maximo and nova.max() < maximo))
+    antiga[...] = nova
+    if varrer:
+        novo_minimo, novo_maximo = bruta.min(), bruta.max()
+    else:
+        novo_minimo, novo_maximo = min(minimo, nova.min()), max(maximo, nova.max())
+
+    if (novo_minimo, novo_maximo) != (minimo, maximo):
+        # A escala mudou: renormaliza tudo a partir do resultado bruto em cache
+        cache['saida'][...] = finalizar(bruta, novo_minimo, novo_maximo)
+    else:
+        cache['saida'][_fatia(afetado)] = finalizar(nova, minimo, maximo)
+    cache.update(minimo=novo_minimo, maximo=novo_maximo)
+    return cache['saida']
@@ -0,0 +1,156 @@
+"""
+Leitura de dimensões, canais e profundidade de bits direto do cabeçalho PNG/JPEG/TIFF,
+sem decodificar a imagem (e sem importar cv2/numpy).
+
+As dimensões são as que o cv2.imread devolve com IMREAD_COLOR/IMREAD_GRAYSCALE: a
+orientação EXIF é aplicada, então as orientações 5 a 8 (rotação de 90°) trocam
+largura e altura (IMREAD_UNCHANGED não rotaciona).
+"""
+import struct
+from collections import namedtuple
+
+InfoImagem = namedtuple('InfoImagem', ['formato', 'largura', 'altura', 'canais', 'bits', 'orientacao'],
+                        defaults=(1,))
+
+# Tipo de cor do PNG -> número de canais
+_CANAIS_PNG = {0: 1, 2: 3, 3: 3, 4: 2, 6: 4}
+
+# Marcadores SOF do JPEG (exceto DHT=C4, JPG=C8 e DAC=CC)
+_MARCADORES_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+# Tag EXIF/TIFF Orientation (1 = normal; 5 a 8 giram a imagem em 90°)
+_TAG_ORIENTACAO = 0x0112
+
+def _orientacao_exif(dados):
+    """Orientação lida de um bloco EXIF (estrutura TIFF: cabeçalho + IFD0); 1 se ausente"""
+    try:
+        ordem = {b'II': '<', b'MM': '>'}[dados[:2]]
+        (deslocamento_ifd,) = struct.unpack_from(ordem + 'I', dados, 4)
+        (num_entradas,) = struct.unpack_from(ordem + 'H', dados, deslocamento_ifd)
+        for i in range(num_entradas):
+            tag, tipo, _, valor = struct.unpack_from(ordem + 'HHIH', dados, deslocamento_ifd + 2 + 12 * i)
+            if tag == _TAG_ORIENTACAO and tipo == 3:  # SHORT
+                return valor
+    except (KeyError, struct.error):
+        pass
+    return 1
+
+def _orientar(info):
+    """Troca largura e altura quando a orientação EXIF gira a imagem em 90° (5 a 8)"""
+    if info is not None and 5 <= info.orientacao <= 8:
+        return info._replace(largura=info.altura, altura=info.largura)
+    return info
+
+def _sondar_png(arquivo):
+    cabecalho = arquivo.read(26)
+    if len(cabecalho) < 26 or cabecalho[12:16] != b'IHDR':
+        return None
+    largura, altura, bits, tipo_cor = struct.unpack('>IIBB', cabecalho[16:26])
+
+    # Procura o bloco eXIf (orientação), que precisa vir antes dos dados da imagem
+    orientacao = 1
+    arquivo.seek(33)  # assinatura (8) + IHDR (4 + 4 + 13 + CRC 4)
+    while True:
+        bloco = arquivo.read(8)
+        if len(bloco) < 8:
+            break
+        tamanho, tipo = struct.unpack('>I4s', bloco)
+        if tipo in (b'IDAT', b'IEND'):
+            break
+        if tipo == b'eXIf':
+            orientacao = _orientacao_exif(arquivo.read(tamanho))
+            break
+        arquivo.seek(tamanho + 4, 1)  # dados + CRC
+
+    # Paleta: os índices têm "bits" bits, mas a imagem decodificada tem 8 bits por canal
+    return InfoImagem('png', largura, altura, _CANAIS_PNG.get(tipo_cor, 0), 8 if tipo_cor == 3 else bits,
+                      orientacao)
+
+def _sondar_jpeg(arquivo):
+    arquivo.seek(2)
+    orientacao = 1
+    while True:
+        byte = arquivo.read(1)
+        if not byte:
+            return None
+        if byte != b'\xff':
+            continue
+        marcador = arquivo.read(1)
+        while marcador == b'\xff':  # bytes de preenchimento
+            marcador = arquivo.read(1)
+        if not marcador:
+            return None
+        codigo = marcador[0]
+        if codigo == 0xD9 or codigo == 0xDA:  # fim da imagem / início dos dados sem SOF
+            return None
+        if 0xD0 <= codigo <= 0xD8 or codigo == 0x01:  # marcadores sem comprimento
+            continue
+        tamanho = arquivo.read(2)
+        if len(tamanho) < 2:
+            return None
+        tamanho = struct.unpack('>H', tamanho)[0]
+        if codigo == 0xE1:  # APP1: EXIF (vem antes do SOF)
+            dados = arquivo.read(tamanho - 2)
+            if dados[:6] == b'Exif\x00\x00':
+                orientacao = _orientacao_exif(dados[6:])
+            continue
+        if codigo in _MARCADORES_SOF:
+            dados = arquivo.read(6)
+            if len(dados) < 6:
+                return None
+            bits, altura, largura, canais = struct.unpack('>BHHB', dados)
+            return InfoImagem('jpeg', largura, altura, canais, bits, orientacao)
+        arquivo.seek(tamanho - 2, 1)
+
+def _sondar_tiff(arquivo, ordem):
+    def ler(formato, posicao=None):
+        if posicao is not None:
+            arquivo.seek(posicao)
+        tamanho = struct.calcsize(formato)
+        dados = arquivo.read(tamanho)
+        if len(dados) < tamanho:
+            raise ValueError("TIFF truncado")
+        return struct.unpack(ordem + formato, dados)
+
+    (deslocamento_ifd,) = ler('I', 4)
+    (num_entradas,) = ler('H', deslocamento_ifd)
+    tags = {}
+    for i in range(num_entradas):
+        tag, tipo, quantidade = ler('HHI', deslocamento_ifd + 2 + 12 * i)
+        if tipo == 3:  # SHORT
+            valor = ler('H')[0] if quantidade <= 2 else ler('H', ler('I')[0])[0]
+        elif tipo == 4:  # LONG
+            valor = ler('I')[0] if quantidade == 1 else ler('I', ler('I')[0])[0]
+        else:
+            continue
+        tags[tag] = valor
+
+    if 256 not in tags or 257 not in tags:
+        return None
+    # 256 = largura, 257 = altura, 258 = bits por amostra, 277 = amostras por pixel
+    return InfoImagem('tiff', tags[256], tags[257], tags.get(277, 1), tags.get(258, 1),
+                      tags.get(_TAG_ORIENTACAO, 1))
+
+def sondar_imagem(caminho):
+    """
+    Lê as informações básicas de uma imagem pelo cabeçalho
+    Returns:
+        InfoImagem(formato, largura, altura, canais, bits, orientacao) ou None se o formato
+        não for reconhecido ou o arquivo não puder ser lido; largura e altura já consideram
+        a orientação EXIF, como a imagem decodificada pelo cv2.imread
+    """
+    try:
+        with open(caminho, 'rb') as arquivo:
+            assinatura = arquivo.read(8)
+            arquivo.seek(0)
+            if assinatura == b'\x89PNG\r\n\x1a\n':
+                return _orientar(_sondar_png(arquivo))
+            if assinatura[:2] == b'\xff\xd8':
+                return _orientar(_sondar_jpeg(arquivo))
+            if assinatura[:4] == b'II*\x00':
+                return _orientar(_sondar_tiff(arquivo, '<'))
+            if assinatura[:4] == b'MM\x00*':
+                return _orientar(_sondar_tiff(arquivo, '>'))
+            return None
+    except (OSError, ValueError, struct.error):
+        return None
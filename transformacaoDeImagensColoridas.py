@@ -1,63 +1,63 @@
-import cv2
 import os
 import argparse
 import numpy as np
 
-def carregar_imagem(caminho_entrada):
-    """Carrega a imagem e normaliza para float32 no intervalo [0,1]"""
-    imagem = cv2.imread(caminho_entrada)
-    if imagem is None:
-        print(f"Erro: Não foi possível carregar a imagem {caminho_entrada}!")
-        return None
-    return imagem.astype(np.float32) / 255.0
+from arquivosDeImagem import carregar_imagem, salvar_imagem
+from execucaoEmFaixas import executar_em_faixas
+from perfilDesempenho import aplicar_perfil
+from precisao import obter_precisao, transformacao_linear
+from regiaoDeInteresse import processar_com_regiao
 
-def aplicar_transformacao_sepia(imagem):
-    """Aplica a transformação de sépia conforme o item (a)"""
-    # Converte de BGR para RGB
-    imagem_rgb = cv2.cvtColor(imagem, cv2.COLOR_BGR2RGB)
+def aplicar_transformacao_sepia(imagem, precisao=None, regiao=None, cache=None):
+    """
+    Aplica a transformação de sépia conforme o item (a)
+    Aceita uma imagem (H, W, 3) ou uma pilha (N, H, W, 3) em BGR normalizada [0,1]
+    precisao: float64, float32, float16 ou fixo16 (None = política global, ver precisao.py)
+    regiao/cache: reprocessa só a área editada de uma imagem (H, W, 3) (ver regiaoDeInteresse.py)
+    """
+    precisao = obter_precisao(precisao)
+    return processar_com_regiao(
+        lambda recorte: executar_em_faixas(lambda faixa: _transformacao_sepia(faixa, precisao),
+                                           (recorte,), recorte.shape),
+        imagem, regiao, cache, ('sepia', precisao))
 
-    # Matriz de transformação (efeito sépia)
+def _transformacao_sepia(imagem, precisao):
+    """Sépia de uma faixa da imagem"""
+    # Matriz de transformação (efeito sépia), definida sobre RGB
     matriz_transformacao = np.array([
         [0.393, 0.769, 0.189],
         [0.349, 0.686, 0.168],
         [0.272, 0.534, 0.131]
     ])
     
-    # Aplica a transformação
-    transformada = np.dot(imagem_rgb, matriz_transformacao.T)
-    
-    # Clipa os valores para o intervalo [0,1] e converte para 8 bits
-    transformada = np.clip(transformada, 0, 1)
-    transformada = (transformada * 255).astype(np.uint8)
+    # Inverter linhas e colunas equivale a converter BGR->RGB, aplicar e voltar para BGR,
+    # e funciona para qualquer número de dimensões à esquerda (lotes).
+    # O resultado já sai clipado e em 8 bits
+    return transformacao_linear(imagem, matriz_transformacao[::-1, ::-1], precisao)
 
-    # Converte de volta para BGR antes de salvar
-    return cv2.cvtColor(transformada, cv2.COLOR_RGB2BGR)
+def aplicar_transformacao_monocromatica(imagem, precisao=None, regiao=None, cache=None):
+    """
+    Aplica a transformação monocromática conforme o item (b)
+    Aceita uma imagem (H, W, 3) ou uma pilha (N, H, W, 3) em BGR normalizada [0,1]
+    precisao: float64, float32, float16 ou fixo16 (None = política global, ver precisao.py)
+    regiao/cache: reprocessa só a área editada de uma imagem (H, W, 3) (ver regiaoDeInteresse.py)
+    """
+    precisao = obter_precisao(precisao)
+    return processar_com_regiao(
+        lambda recorte: executar_em_faixas(lambda faixa: _transformacao_monocromatica(faixa, precisao),
+                                           (recorte,), recorte.shape),
+        imagem, regiao, cache, ('monocromatica', precisao))
 
-def aplicar_transformacao_monocromatica(imagem):
-    """Aplica a transformação monocromática conforme o item (b)"""
-    # Converte de BGR para RGB
-    imagem_rgb = cv2.cvtColor(imagem, cv2.COLOR_BGR2RGB)
-    
-    # Pesos para conversão para escala de cinza
-    pesos = np.array([0.2989, 0.5870, 0.1140])
+def _transformacao_monocromatica(imagem, precisao):
+    """Tons de cinza (replicados nos 3 canais) de uma faixa da imagem"""
+    # Pesos para conversão para escala de cinza (R, G, B), invertidos para a ordem BGR
+    pesos = np.array([[0.2989, 0.5870, 0.1140]])[:, ::-1]
     
-    # Calcula a média ponderada para cada pixel
-    monocromatica = np.dot(imagem_rgb, pesos)
+    # Média ponderada para cada pixel, já clipada e em 8 bits (forma (..., 1))
+    monocromatica = transformacao_linear(imagem, pesos, precisao)
     
     # Repete o valor em todos os 3 canais para manter a imagem colorida (mas em tons de cinza)
-    monocromatica = np.stack([monocromatica]*3, axis=-1)
-    
-    # Clipa e converte para 8 bits
-    monocromatica = np.clip(monocromatica, 0, 1)
-    monocromatica = (monocromatica * 255).astype(np.uint8)
-    
-    return monocromatica
-
-def salvar_imagem(caminho_saida, imagem):
-    """Salva a imagem no caminho especificado"""
-    os.makedirs(os.path.dirname(caminho_saida), exist_ok=True)
-    cv2.imwrite(caminho_saida, imagem)
-    print(f"✅ Imagem transformada salva em: {caminho_saida}")
+    return np.repeat(monocromatica, 3, axis=-1)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Aplica transformações de cores em imagens RGB')
@@ -67,6 +67,7 @@ if __name__ == "__main__":
                         help='Tipo de transformação a ser aplicada (sepia ou monocromatica)', default='sepia')
     
     args = parser.parse_args()
+    aplicar_perfil()
     
     # Configura caminhos
     pasta_entradas = os.path.join(os.path.dirname(__file__), 'Entradas')
@@ -82,10 +83,10 @@ if __name__ == "__main__":
     caminho_saida = os.path.join(pasta_saidas, nome_saida)
     
     # Processa a imagem
-    imagem = carregar_imagem(caminho_entrada)
+    imagem = carregar_imagem(caminho_entrada, cinza=False)
     if imagem is not None:
         if args.transformacao == 'sepia':
             imagem_transformada = aplicar_transformacao_sepia(imagem)
         else:
             imagem_transformada = aplicar_transformacao_monocromatica(imagem)
-        salvar_imagem(caminho_saida, imagem_transformada)
\ No newline at end of file
+        salvar_imagem(caminho_saida, imagem_transformada, 'Imagem transformada salva')
\ No newline at end of file
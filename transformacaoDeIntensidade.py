@@ -3,72 +3,110 @@ import os
 import argparse
 import numpy as np
 
-def carregar_imagem(caminho_entrada):
-    """Carrega a imagem em tons de cinza e normaliza para float32 no intervalo [0,1]"""
-    imagem = cv2.imread(caminho_entrada, cv2.IMREAD_GRAYSCALE)
-    if imagem is None:
-        print(f"Erro: Não foi possível carregar a imagem {caminho_entrada}!")
-        return None
-    return imagem.astype(np.float32) / 255.0
+from arquivosDeImagem import carregar_imagem, salvar_imagem
+from perfilDesempenho import aplicar_perfil
+from regiaoDeInteresse import processar_com_regiao, retangulo_da_regiao
 
-def aplicar_transformacoes(imagem, transformacao):
+def aplicar_transformacoes(imagem, transformacao, regiao=None, cache=None):
     """
     Aplica diferentes transformações de intensidade na imagem
     Args:
         imagem: imagem normalizada [0,1]
         transformacao: tipo de transformação a aplicar
+        regiao: retângulo (x, y, largura, altura) ou máscara da área editada desde a última
+                chamada com o mesmo cache; só os pixels afetados por ela são recalculados
+        cache: dicionário com a saída anterior (ver regiaoDeInteresse.processar_com_regiao)
     Returns:
         Imagem transformada em formato uint8 [0,255] ou None em caso de erro
     """
     try:
-        # Converte para valores de 8 bits (0-255)
-        img_8bit = (imagem * 255).astype(np.uint8)
-        transformada = img_8bit.copy()
-
         if transformacao == 'negativo':
-            transformada = 255 - img_8bit
+            return processar_com_regiao(lambda recorte: 255 - _para_8bit(recorte),
+                                        imagem, regiao, cache, transformacao)
         
         elif transformacao == 'intervalo':
-            min_val, max_val = np.min(img_8bit), np.max(img_8bit)
-            if max_val == min_val:  # Evita divisão por zero
-                transformada = np.full_like(img_8bit, 150)  # Valor médio se todos pixels forem iguais
-            else:
-                transformada = ((img_8bit - min_val) / (max_val - min_val)) * 100 + 100
-                transformada = transformada.astype(np.uint8)
+            # Depende do mínimo/máximo globais, mantidos pelo cache
+            return processar_com_regiao(_para_8bit, imagem, regiao, cache, transformacao,
+                                        finalizar=_ajustar_intervalo)
         
-        elif transformacao == 'inverter_pares':
-            transformada[::2, :] = transformada[::2, ::-1]  # Inverte linhas pares
-        
-        elif transformacao == 'reflexao_linhas':
-            h, w = transformada.shape
-            metade = (h + 1) // 2  # Arredonda para cima para pegar a linha do meio na parte superior
-            parte_superior = transformada[:metade]
-            # Ajusta o tamanho da parte inferior para combinar com o espelhamento
-            transformada[-metade:] = parte_superior[::-1][-metade:]  # Espelha a metade superior
-        
-        elif transformacao == 'espelhamento_vertical':
-            transformada = cv2.flip(img_8bit, 0)
+        elif transformacao in TRANSFORMACOES_GEOMETRICAS:
+            return _geometrica_com_regiao(imagem, transformacao, regiao, cache)
         
         else:
             raise ValueError(f"Transformação desconhecida: {transformacao}")
-        
-        return transformada
 
     except Exception as e:
         print(f"Erro durante a transformação {transformacao}: {str(e)}")
         return None
 
-def salvar_imagem(caminho_saida, imagem):
-    """Salva a imagem no caminho especificado"""
-    try:
-        os.makedirs(os.path.dirname(caminho_saida), exist_ok=True)
-        if not cv2.imwrite(caminho_saida, imagem):
-            raise IOError(f"Falha ao salvar imagem em {caminho_saida}")
-        print(f"✅ Imagem transformada salva em: {caminho_saida}")
-        return True
-    except Exception as e:
-        print(f"❌ Erro ao salvar imagem: {str(e)}")
-        return False
+TRANSFORMACOES_GEOMETRICAS = ['inverter_pares', 'reflexao_linhas', 'espelhamento_vertical']
+
+def _para_8bit(imagem):
+    """Converte para valores de 8 bits (0-255)"""
+    return (imagem * 255).astype(np.uint8)
+
+def _ajustar_intervalo(img_8bit, min_val, max_val):
+    """Mapeia [min_val, max_val] para [100, 200]"""
+    if max_val == min_val:  # Evita divisão por zero
+        return np.full_like(img_8bit, 150)  # Valor médio se todos pixels forem iguais
+    transformada = ((img_8bit - min_val) / (max_val - min_val)) * 100 + 100
+    return transformada.astype(np.uint8)
+
+def _transformacao_geometrica(img_8bit, transformacao):
+    """Transformações que só reposicionam pixels, aplicadas à imagem inteira"""
+    transformada = img_8bit.copy()
+
+    if transformacao == 'inverter_pares':
+        transformada[::2, :] = transformada[::2, ::-1]  # Inverte linhas pares
+    
+    elif transformacao == 'reflexao_linhas':
+        h, w = transformada.shape
+        metade = (h + 1) // 2  # Arredonda para cima para pegar a linha do meio na parte superior
+        parte_superior = transformada[:metade]
+        # Ajusta o tamanho da parte inferior para combinar com o espelhamento
+        transformada[-metade:] = parte_superior[::-1][-metade:]  # Espelha a metade superior
+    
+    elif transformacao == 'espelhamento_vertical':
+        transformada = cv2.flip(img_8bit, 0)
+    
+    return transformada
+
+def _origem_geometrica(transformacao, linhas, colunas, forma):
+    """Coordenadas de origem na entrada de cada pixel de saída (linhas em coluna, colunas em linha)"""
+    h, w = forma
+    if transformacao == 'inverter_pares':
+        return linhas, np.where(linhas % 2 == 0, w - 1 - colunas, colunas)
+    if transformacao == 'reflexao_linhas':
+        metade = (h + 1) // 2
+        return np.where(linhas >= h - metade, h - 1 - linhas, linhas), colunas
+    return h - 1 - linhas, colunas  # espelhamento_vertical
+
+def _geometrica_com_regiao(imagem, transformacao, regiao, cache):
+    """
+    Transformações geométricas com reprocessamento da região editada: os pixels de saída
+    afetados estão na própria região ou em seus espelhos vertical/horizontal
+    """
+    forma = imagem.shape[:2]
+    if (cache is None or regiao is None or cache.get('chave') != transformacao
+            or cache.get('forma') != forma):
+        transformada = _transformacao_geometrica(_para_8bit(imagem), transformacao)
+        if cache is not None:
+            cache.clear()
+            cache.update(chave=transformacao, forma=forma, saida=transformada)
+        return transformada
+
+    retangulo = retangulo_da_regiao(regiao, forma)
+    if retangulo is None:
+        return cache['saida']
+
+    h, w = forma
+    y0, y1, x0, x1 = retangulo
+    for y0_s, y1_s, x0_s, x1_s in [(y0, y1, x0, x1), (h - y1, h - y0, x0, x1), (y0, y1, w - x1, w - x0)]:
+        linhas = np.arange(y0_s, y1_s)[:, np.newaxis]
+        colunas = np.arange(x0_s, x1_s)[np.newaxis, :]
+        origem_linhas, origem_colunas = _origem_geometrica(transformacao, linhas, colunas, forma)
+        cache['saida'][y0_s:y1_s, x0_s:x1_s] = _para_8bit(imagem[origem_linhas, origem_colunas])
+    return cache['saida']
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
@@ -78,8 +116,7 @@ if __name__ == "__main__":
     parser.add_argument('entrada', 
                        help='Nome da imagem na pasta Entradas (ex: foto.jpg)')
     parser.add_argument('-t', '--transformacao', 
-                       choices=['negativo', 'intervalo', 'inverter_pares', 
-                               'reflexao_linhas', 'espelhamento_vertical'],
+                       choices=['negativo', 'intervalo'] + TRANSFORMACOES_GEOMETRICAS,
                        required=True,
                        help='Tipo de transformação a aplicar')
     parser.add_argument('-s', '--saida', 
@@ -87,6 +124,7 @@ if __name__ == "__main__":
                        default=None)
     
     args = parser.parse_args()
+    aplicar_perfil()
 
     # Configura caminhos
     pasta_entradas = os.path.join(os.path.dirname(__file__), 'Entradas')
@@ -107,5 +145,5 @@ if __name__ == "__main__":
     nome_saida = f"{args.saida or f'transformada_{args.transformacao}_{nome_base}'}.png"
     caminho_saida = os.path.join(pasta_saidas, nome_saida)
 
-    if not salvar_imagem(caminho_saida, imagem_transformada):
+    if not salvar_imagem(caminho_saida, imagem_transformada, 'Imagem transformada salva'):
         exit(1)
\ No newline at end of file